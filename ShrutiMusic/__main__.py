@@ -28,9 +28,12 @@ from pytgcalls.exceptions import NoActiveGroupCall
 import config
 from ShrutiMusic import LOGGER, app, userbot
 from ShrutiMusic.core.call import Nand
+from ShrutiMusic.core.http import http
+from ShrutiMusic.core.workers import workers
 from ShrutiMusic.misc import sudo
 from ShrutiMusic.plugins import ALL_MODULES
-from ShrutiMusic.utils.database import get_banned_users, get_gbanned
+from ShrutiMusic.utils.database import iter_banned_users, iter_gbanned
+from ShrutiMusic.utils.database.cache import settings
 from config import BANNED_USERS
 
 # Bot Commands List
@@ -99,24 +102,17 @@ async def setup_bot_commands():
         LOGGER("ShrutiMusic").error(f"Failed to set bot commands: {str(e)}")
 
 async def init():
-    if (
-        not config.STRING1
-        and not config.STRING2
-        and not config.STRING3
-        and not config.STRING4
-        and not config.STRING5
-    ):
+    if not config.STRING_SESSIONS:
         LOGGER(__name__).error("Assistant client variables not defined, exiting...")
         exit()
 
     await sudo()
+    settings.start()
 
     try:
-        users = await get_gbanned()
-        for user_id in users:
+        async for user_id in iter_gbanned():
             BANNED_USERS.add(user_id)
-        users = await get_banned_users()
-        for user_id in users:
+        async for user_id in iter_banned_users():
             BANNED_USERS.add(user_id)
     except:
         pass
@@ -152,8 +148,13 @@ async def init():
 
     await idle()
 
+    from ShrutiMusic.plugins.tools.lovebirds import ledger
+
+    await ledger.close()
+    await workers.stop()
     await app.stop()
     await userbot.stop()
+    await http.close()
     LOGGER("ShrutiMusic").info("Stopping Shruti Music Bot...🥺")
 
 if __name__ == "__main__":
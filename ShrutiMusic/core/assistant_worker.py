@@ -0,0 +1,152 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+"""
+Runs the PyTgCalls side of one or more assistants in its own process.
+
+Started by ShrutiMusic.core.workers as a plain script (not through the
+package, whose import runs the bot's startup work). It connects back to
+the coordinator over a unix socket, executes call commands for its
+assistants and reports stream/call events. It keeps no queue state.
+
+    python assistant_worker.py <socket> <index> <assistant> [<assistant> ...]
+"""
+
+import os
+import sys
+
+if __name__ == "__main__":
+    # started as a script: put the repo root in place of this folder so
+    # config is importable and core/http.py does not shadow the stdlib
+    sys.path[0] = os.getcwd()
+
+import asyncio
+import pickle
+import struct
+
+HEADER = struct.Struct("!I")
+TOKEN_ENV = "ASSISTANT_WORKER_TOKEN"
+TOKEN_SIZE = 32
+# raw token + worker index, checked before anything is unpickled
+HELLO = struct.Struct(f"!{TOKEN_SIZE}sI")
+
+
+async def read_frame(reader):
+    (size,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+    return pickle.loads(await reader.readexactly(size))
+
+
+def write_frame(writer, frame):
+    data = pickle.dumps(frame)
+    writer.write(HEADER.pack(len(data)) + data)
+
+
+def dump_error(error: BaseException):
+    return (type(error).__module__, type(error).__qualname__, error.args)
+
+
+async def serve(path: str, index: int, numbers: list):
+    from pyrogram import Client
+    from pytgcalls import PyTgCalls
+
+    import config
+
+    clients = {
+        num: PyTgCalls(
+            Client(
+                name=f"NandAss{num}",
+                api_id=config.API_ID,
+                api_hash=config.API_HASH,
+                session_string=str(config.STRING_SESSIONS[num]),
+            ),
+            cache_duration=100,
+        )
+        for num in numbers
+    }
+    reader, writer = await asyncio.open_unix_connection(path)
+    writer.write(HELLO.pack(os.environ.pop(TOKEN_ENV, "").encode(), index))
+
+    def emit(kind, num, payload):
+        write_frame(writer, ("event", kind, num, payload))
+
+    for num, calls in clients.items():
+
+        async def on_kicked(_, chat_id: int, num=num):
+            emit("kicked", num, chat_id)
+
+        async def on_closed(_, chat_id: int, num=num):
+            emit("closed", num, chat_id)
+
+        async def on_left(_, chat_id: int, num=num):
+            emit("left", num, chat_id)
+
+        async def on_stream_end(_, update, num=num):
+            emit("stream_end", num, update)
+
+        calls.on_kicked()(on_kicked)
+        calls.on_closed_voice_chat()(on_closed)
+        calls.on_left()(on_left)
+        calls.on_stream_end()(on_stream_end)
+
+    await asyncio.gather(*(calls.start() for calls in clients.values()))
+    write_frame(writer, ("ready", index, None, None))
+    await writer.drain()
+
+    async def handle(req_id, num, method, args, kwargs):
+        try:
+            target = clients[num]
+            if method == "ping":
+                value = await target.ping
+            else:
+                value = await getattr(target, method)(*args, **kwargs)
+            reply = ("reply", req_id, True, value)
+            pickle.dumps(reply)
+        except Exception as e:
+            reply = ("reply", req_id, False, dump_error(e))
+        write_frame(writer, reply)
+        await writer.drain()
+
+    while True:
+        try:
+            req_id, num, method, args, kwargs = await read_frame(reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            # coordinator is gone, nothing left to serve
+            break
+        asyncio.create_task(handle(req_id, num, method, args, kwargs))
+
+
+if __name__ == "__main__":
+    asyncio.run(serve(sys.argv[1], int(sys.argv[2]), [int(n) for n in sys.argv[3:]]))
+
+
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
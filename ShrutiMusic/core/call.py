@@ -21,7 +21,9 @@
 
 
 import asyncio
-import os
+import random
+import time
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Union
 
@@ -40,6 +42,7 @@ from pytgcalls.types.stream import StreamAudioEnded
 
 import config
 from ShrutiMusic import LOGGER, YouTube, app
+from ShrutiMusic.core.workers import workers
 from ShrutiMusic.misc import db
 from ShrutiMusic.utils.database import (
     add_active_chat,
@@ -54,17 +57,33 @@ from ShrutiMusic.utils.database import (
     set_loop,
 )
 from ShrutiMusic.utils.exceptions import AssistantErr
-from ShrutiMusic.utils.formatters import check_duration, seconds_to_min, speed_converter
+from ShrutiMusic.utils.formatters import time_to_seconds
 from ShrutiMusic.utils.inline.play import stream_markup
 from ShrutiMusic.utils.stream.autoclear import auto_clean
+from ShrutiMusic.utils.stream.position import (
+    get_played,
+    pause_played,
+    resume_played,
+    set_played,
+)
+from ShrutiMusic.utils.stream.live import live_urls
+from ShrutiMusic.utils.stream.prefetch import cancel_prefetch, prefetch
+from ShrutiMusic.utils.stream.seekindex import keyframe_before
+from ShrutiMusic.utils.stream.speed import reset_speed, speed_cache
 from ShrutiMusic.utils.thumbnails import gen_thumb
 from strings import get_string
 
 autoend = {}
 counter = {}
+# chat_id -> [assistant, video] for every call an assistant is in
+calls = {}
+# assistant -> timestamps of its recent call errors
+failures = {}
 
 
 async def _clear_(chat_id):
+    cancel_prefetch(chat_id)
+    calls.pop(chat_id, None)
     db[chat_id] = []
     await remove_active_video_chat(chat_id)
     await remove_active_chat(chat_id)
@@ -72,64 +91,98 @@ async def _clear_(chat_id):
 
 class Call(PyTgCalls):
     def __init__(self):
-        self.userbot1 = Client(
-            name="NandAss1",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING1),
-        )
-        self.one = PyTgCalls(
-            self.userbot1,
-            cache_duration=100,
-        )
-        self.userbot2 = Client(
-            name="NandAss2",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING2),
-        )
-        self.two = PyTgCalls(
-            self.userbot2,
-            cache_duration=100,
-        )
-        self.userbot3 = Client(
-            name="NandAss3",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING3),
-        )
-        self.three = PyTgCalls(
-            self.userbot3,
-            cache_duration=100,
-        )
-        self.userbot4 = Client(
-            name="NandAss4",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING4),
-        )
-        self.four = PyTgCalls(
-            self.userbot4,
-            cache_duration=100,
-        )
-        self.userbot5 = Client(
-            name="NandAss5",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING5),
-        )
-        self.five = PyTgCalls(
-            self.userbot5,
-            cache_duration=100,
-        )
+        # assistant number -> PyTgCalls, numbers follow STRING_SESSION<N>
+        if config.ASSISTANT_WORKERS > 0:
+            self.pool = workers.proxies(
+                list(config.STRING_SESSIONS), config.ASSISTANT_WORKERS
+            )
+            return
+        self.pool = {
+            num: PyTgCalls(
+                Client(
+                    name=f"NandAss{num}",
+                    api_id=config.API_ID,
+                    api_hash=config.API_HASH,
+                    session_string=str(session),
+                ),
+                cache_duration=100,
+            )
+            for num, session in config.STRING_SESSIONS.items()
+        }
+
+    def by_number(self, assistant: int):
+        return self.pool.get(int(assistant))
+
+    def number_of(self, client):
+        """Assistant number of a client handed out by group_assistant."""
+        for num, calls_client in self.pool.items():
+            if calls_client is client:
+                return num
+        return None
+
+    def loads(self, assistants) -> dict:
+        load = dict.fromkeys(assistants, 0.0)
+        for assistant, video in calls.values():
+            if assistant in load:
+                load[assistant] += config.VIDEO_CALL_WEIGHT if video else 1
+        return load
+
+    def healthy(self, assistant) -> bool:
+        recent = failures.get(assistant)
+        if not recent:
+            return True
+        edge = time.monotonic() - config.ASSISTANT_ERROR_WINDOW
+        while recent and recent[0] < edge:
+            recent.popleft()
+        return len(recent) < config.ASSISTANT_ERROR_LIMIT
+
+    def least_loaded(self, assistants) -> int:
+        healthy = [num for num in assistants if self.healthy(num)] or assistants
+        load = self.loads(healthy)
+        return min(healthy, key=lambda num: (load[num], random.random()))
+
+    def should_migrate(self, assistant, assistants) -> bool:
+        gap = config.ASSISTANT_MIGRATE_GAP
+        if gap <= 0 or assistant not in assistants or len(assistants) < 2:
+            return False
+        load = self.loads(assistants)
+        return load[assistant] - load[self.least_loaded(assistants)] >= gap
+
+    def failed(self, chat_id: int, assistant=None):
+        if assistant is None and chat_id in calls:
+            assistant = calls[chat_id][0]
+        if assistant is not None:
+            failures.setdefault(assistant, deque()).append(time.monotonic())
+
+    def load_report(self, assistants) -> list:
+        load = self.loads(assistants)
+        report = []
+        for num in assistants:
+            live = [video for assistant, video in calls.values() if assistant == num]
+            healthy = self.healthy(num)
+            report.append(
+                {
+                    "assistant": num,
+                    "calls": len(live),
+                    "video": sum(live),
+                    "load": load[num],
+                    "errors": len(failures.get(num, ())),
+                    "healthy": healthy,
+                }
+            )
+        return report
 
     async def pause_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         await assistant.pause_stream(chat_id)
+        if db.get(chat_id):
+            pause_played(db[chat_id][0])
 
     async def resume_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         await assistant.resume_stream(chat_id)
+        if db.get(chat_id):
+            resume_played(db[chat_id][0])
 
     async def stop_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
@@ -140,88 +193,34 @@ class Call(PyTgCalls):
             pass
 
     async def stop_stream_force(self, chat_id: int):
-        try:
-            if config.STRING1:
-                await self.one.leave_group_call(chat_id)
-        except:
-            pass
-        try:
-            if config.STRING2:
-                await self.two.leave_group_call(chat_id)
-        except:
-            pass
-        try:
-            if config.STRING3:
-                await self.three.leave_group_call(chat_id)
-        except:
-            pass
-        try:
-            if config.STRING4:
-                await self.four.leave_group_call(chat_id)
-        except:
-            pass
-        try:
-            if config.STRING5:
-                await self.five.leave_group_call(chat_id)
-        except:
-            pass
+        for assistant in self.pool.values():
+            try:
+                await assistant.leave_group_call(chat_id)
+            except:
+                pass
         try:
             await _clear_(chat_id)
         except:
             pass
 
-    async def speedup_stream(self, chat_id: int, file_path, speed, playing):
+    async def speedup_stream(self, chat_id: int, file_path, speed, playing, seconds=None):
         assistant = await group_assistant(self, chat_id)
-        if str(speed) != str("1.0"):
-            base = os.path.basename(file_path)
-            chatdir = os.path.join(os.getcwd(), "playback", str(speed))
-            if not os.path.isdir(chatdir):
-                os.makedirs(chatdir)
-            out = os.path.join(chatdir, base)
-            if not os.path.isfile(out):
-                if str(speed) == str("0.5"):
-                    vs = 2.0
-                if str(speed) == str("0.75"):
-                    vs = 1.35
-                if str(speed) == str("1.5"):
-                    vs = 0.68
-                if str(speed) == str("2.0"):
-                    vs = 0.5
-                proc = await asyncio.create_subprocess_shell(
-                    cmd=(
-                        "ffmpeg "
-                        "-i "
-                        f"{file_path} "
-                        "-filter:v "
-                        f"setpts={vs}*PTS "
-                        "-filter:a "
-                        f"atempo={speed} "
-                        f"{out}"
-                    ),
-                    stdin=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                await proc.communicate()
-            else:
-                pass
-        else:
-            out = file_path
-        dur = await asyncio.get_event_loop().run_in_executor(None, check_duration, out)
-        dur = int(dur)
-        played, con_seconds = speed_converter(playing[0]["played"], speed)
-        duration = seconds_to_min(dur)
+        video = playing[0]["streamtype"] == "video"
+        if seconds is None:
+            seconds = get_played(playing[0])
+        out, params, seconds = speed_cache.parameters(file_path, speed, seconds, video)
         stream = (
             AudioVideoPiped(
                 out,
                 audio_parameters=HighQualityAudio(),
                 video_parameters=MediumQualityVideo(),
-                additional_ffmpeg_parameters=f"-ss {played} -to {duration}",
+                additional_ffmpeg_parameters=params,
             )
-            if playing[0]["streamtype"] == "video"
+            if video
             else AudioPiped(
                 out,
                 audio_parameters=HighQualityAudio(),
-                additional_ffmpeg_parameters=f"-ss {played} -to {duration}",
+                additional_ffmpeg_parameters=params,
             )
         )
         if str(db[chat_id][0]["file"]) == str(file_path):
@@ -229,15 +228,11 @@ class Call(PyTgCalls):
         else:
             raise AssistantErr("Umm")
         if str(db[chat_id][0]["file"]) == str(file_path):
-            exis = (playing[0]).get("old_dur")
-            if not exis:
-                db[chat_id][0]["old_dur"] = db[chat_id][0]["dur"]
-                db[chat_id][0]["old_second"] = db[chat_id][0]["seconds"]
-            db[chat_id][0]["played"] = con_seconds
-            db[chat_id][0]["dur"] = duration
-            db[chat_id][0]["seconds"] = dur
-            db[chat_id][0]["speed_path"] = out
+            # position keeps counting in seconds of the original file
+            set_played(db[chat_id][0], seconds, rate=float(speed))
+            db[chat_id][0]["speed_path"] = None if out == file_path else out
             db[chat_id][0]["speed"] = speed
+        return seconds
 
     async def force_stop_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
@@ -246,6 +241,7 @@ class Call(PyTgCalls):
             check.pop(0)
         except:
             pass
+        calls.pop(chat_id, None)
         await remove_active_video_chat(chat_id)
         await remove_active_chat(chat_id)
         try:
@@ -273,24 +269,34 @@ class Call(PyTgCalls):
             chat_id,
             stream,
         )
+        if chat_id in calls:
+            calls[chat_id][1] = bool(video)
+        prefetch(chat_id)
 
     async def seek_stream(self, chat_id, file_path, to_seek, duration, mode):
         assistant = await group_assistant(self, chat_id)
+        start = keyframe_before(file_path, time_to_seconds(to_seek))
+        if start is None:
+            params = f"-ss {to_seek} -to {duration}"
+        else:
+            # start decoding right at the indexed keyframe
+            params = f"-ss {start} -noaccurate_seek -to {duration}"
         stream = (
             AudioVideoPiped(
                 file_path,
                 audio_parameters=HighQualityAudio(),
                 video_parameters=MediumQualityVideo(),
-                additional_ffmpeg_parameters=f"-ss {to_seek} -to {duration}",
+                additional_ffmpeg_parameters=params,
             )
             if mode == "video"
             else AudioPiped(
                 file_path,
                 audio_parameters=HighQualityAudio(),
-                additional_ffmpeg_parameters=f"-ss {to_seek} -to {duration}",
+                additional_ffmpeg_parameters=params,
             )
         )
         await assistant.change_stream(chat_id, stream)
+        return start
 
     async def stream_call(self, link):
         assistant = await group_assistant(self, config.LOG_GROUP_ID)
@@ -340,7 +346,10 @@ class Call(PyTgCalls):
         except AlreadyJoinedError:
             raise AssistantErr(_["call_9"])
         except TelegramServerError:
+            self.failed(chat_id, self.number_of(assistant))
             raise AssistantErr(_["call_10"])
+        # the client actually joined, the settings cache may have expired by now
+        calls[chat_id] = [self.number_of(assistant), bool(video)]
         await add_active_chat(chat_id)
         await music_on(chat_id)
         if video:
@@ -380,16 +389,14 @@ class Call(PyTgCalls):
             original_chat_id = check[0]["chat_id"]
             streamtype = check[0]["streamtype"]
             videoid = check[0]["vidid"]
-            db[chat_id][0]["played"] = 0
-            exis = (check[0]).get("old_dur")
-            if exis:
-                db[chat_id][0]["dur"] = exis
-                db[chat_id][0]["seconds"] = check[0]["old_second"]
-                db[chat_id][0]["speed_path"] = None
-                db[chat_id][0]["speed"] = 1.0
+            set_played(db[chat_id][0], 0)
+            reset_speed(db[chat_id][0])
+            prefetch(chat_id)
             video = True if str(streamtype) == "video" else False
+            if chat_id in calls:
+                calls[chat_id][1] = video
             if "live_" in queued:
-                n, link = await YouTube.video(videoid, True)
+                n, link = await YouTube.live(videoid, True)
                 if n == 0:
                     return await app.send_message(
                         original_chat_id,
@@ -409,6 +416,8 @@ class Call(PyTgCalls):
                 try:
                     await client.change_stream(chat_id, stream)
                 except Exception:
+                    self.failed(chat_id)
+                    live_urls.forget(videoid)
                     return await app.send_message(
                         original_chat_id,
                         text=_["call_6"],
@@ -455,6 +464,7 @@ class Call(PyTgCalls):
                 try:
                     await client.change_stream(chat_id, stream)
                 except:
+                    self.failed(chat_id)
                     return await app.send_message(
                         original_chat_id,
                         text=_["call_6"],
@@ -488,6 +498,7 @@ class Call(PyTgCalls):
                 try:
                     await client.change_stream(chat_id, stream)
                 except:
+                    self.failed(chat_id)
                     return await app.send_message(
                         original_chat_id,
                         text=_["call_6"],
@@ -516,6 +527,7 @@ class Call(PyTgCalls):
                 try:
                     await client.change_stream(chat_id, stream)
                 except:
+                    self.failed(chat_id)
                     return await app.send_message(
                         original_chat_id,
                         text=_["call_6"],
@@ -564,61 +576,29 @@ class Call(PyTgCalls):
                     db[chat_id][0]["markup"] = "stream"
 
     async def ping(self):
-        pings = []
-        if config.STRING1:
-            pings.append(await self.one.ping)
-        if config.STRING2:
-            pings.append(await self.two.ping)
-        if config.STRING3:
-            pings.append(await self.three.ping)
-        if config.STRING4:
-            pings.append(await self.four.ping)
-        if config.STRING5:
-            pings.append(await self.five.ping)
+        pings = await asyncio.gather(*(assistant.ping for assistant in self.pool.values()))
         return str(round(sum(pings) / len(pings), 3))
 
     async def start(self):
         LOGGER(__name__).info("Starting PyTgCalls Client...\n")
-        if config.STRING1:
-            await self.one.start()
-        if config.STRING2:
-            await self.two.start()
-        if config.STRING3:
-            await self.three.start()
-        if config.STRING4:
-            await self.four.start()
-        if config.STRING5:
-            await self.five.start()
+        await workers.start()
+        await asyncio.gather(*(assistant.start() for assistant in self.pool.values()))
 
     async def decorators(self):
-        @self.one.on_kicked()
-        @self.two.on_kicked()
-        @self.three.on_kicked()
-        @self.four.on_kicked()
-        @self.five.on_kicked()
-        @self.one.on_closed_voice_chat()
-        @self.two.on_closed_voice_chat()
-        @self.three.on_closed_voice_chat()
-        @self.four.on_closed_voice_chat()
-        @self.five.on_closed_voice_chat()
-        @self.one.on_left()
-        @self.two.on_left()
-        @self.three.on_left()
-        @self.four.on_left()
-        @self.five.on_left()
         async def stream_services_handler(_, chat_id: int):
             await self.stop_stream(chat_id)
 
-        @self.one.on_stream_end()
-        @self.two.on_stream_end()
-        @self.three.on_stream_end()
-        @self.four.on_stream_end()
-        @self.five.on_stream_end()
         async def stream_end_handler1(client, update: Update):
             if not isinstance(update, StreamAudioEnded):
                 return
             await self.change_stream(client, update.chat_id)
 
+        for assistant in self.pool.values():
+            assistant.on_kicked()(stream_services_handler)
+            assistant.on_closed_voice_chat()(stream_services_handler)
+            assistant.on_left()(stream_services_handler)
+            assistant.on_stream_end()(stream_end_handler1)
+
 
 Nand = Call()
 
@@ -0,0 +1,269 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+
+from pyrogram.errors import FloodWait, MessageNotModified
+
+import config
+
+from ..logging import LOGGER
+
+FOREGROUND = 0
+BACKGROUND = 1
+
+CHAT_BURST = 3
+CHAT_IDLE = 600
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.base = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = time.monotonic()
+
+    def wait(self, now) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def slow_down(self, factor=0.5):
+        self.rate = max(self.base / 8, self.rate * factor)
+
+    def speed_up(self):
+        self.rate = min(self.base, self.rate + self.base / 20)
+
+
+class EditScheduler:
+    """
+    Single queue for periodic and progress edits of bot messages.
+
+    Every edit spends a token from a global and a per-chat bucket. A newer
+    edit of the same message replaces the one still waiting, foreground
+    edits are sent before background ones, and a FloodWait pauses the chat
+    and halves its rate until edits go through again.
+    """
+
+    def __init__(self):
+        self.queues = (OrderedDict(), OrderedDict())
+        self.chats = {}
+        self.inflight = set()
+        self.bucket = TokenBucket(config.EDIT_GLOBAL_RATE, config.EDIT_GLOBAL_RATE)
+        self.sent_at = deque()
+        self.pruned = time.monotonic()
+        self.slots = None
+        self.wakeup = None
+        self.task = None
+        self.counters = {
+            "submitted": 0,
+            "sent": 0,
+            "merged": 0,
+            "dropped": 0,
+            "unchanged": 0,
+            "failed": 0,
+            "floods": 0,
+        }
+
+    def submit(self, message, method, priority=BACKGROUND, **kwargs):
+        """
+        Queue `message.<method>(**kwargs)`. Returns a future that resolves to
+        the call result, or to None when the edit was merged, dropped or failed.
+        """
+        key = (message.chat.id, message.id, method)
+        future = asyncio.get_running_loop().create_future()
+        self.counters["submitted"] += 1
+        placed = False
+        for level, queue in enumerate(self.queues):
+            old = queue.get(key)
+            if old is None:
+                continue
+            self._resolve(old[3], None)
+            self.counters["merged"] += 1
+            if level <= priority:
+                # keep the place in line, only the content changes
+                queue[key] = (message, method, kwargs, future, level)
+                placed = True
+            else:
+                del queue[key]
+            break
+        if not placed:
+            self.queues[priority][key] = (message, method, kwargs, future, priority)
+        self._kick()
+        return future
+
+    def drop(self, message):
+        """Forget every pending edit of a message (e.g. once it was replaced)."""
+        for queue in self.queues:
+            for key in [k for k in queue if k[0] == message.chat.id and k[1] == message.id]:
+                self._resolve(queue.pop(key)[3], None)
+                self.counters["dropped"] += 1
+
+    def _kick(self):
+        if self.task is None or self.task.done():
+            if self.slots is None:
+                self.slots = asyncio.Semaphore(config.EDIT_WORKERS)
+                self.wakeup = asyncio.Event()
+            self.task = asyncio.create_task(self._run())
+        self.wakeup.set()
+
+    @staticmethod
+    def _resolve(future, value):
+        if not future.done():
+            future.set_result(value)
+
+    def _chat(self, chat_id, now):
+        chat = self.chats.get(chat_id)
+        if chat is None:
+            chat = self.chats[chat_id] = {
+                "bucket": TokenBucket(config.EDIT_CHAT_RATE / 60, CHAT_BURST),
+                "until": 0,
+                "used": now,
+            }
+        return chat
+
+    def _prune(self, now):
+        self.pruned = now
+        busy = {key[0] for queue in self.queues for key in queue}
+        busy.update(key[0] for key in self.inflight)
+        for chat_id in [c for c, chat in self.chats.items() if c not in busy and now - chat["used"] > CHAT_IDLE]:
+            del self.chats[chat_id]
+
+    def _next(self, now):
+        if now - self.pruned > 60:
+            self._prune(now)
+        if not any(self.queues):
+            return None, None, None
+        delay = self.bucket.wait(now)
+        if delay:
+            return None, None, delay
+        delay = None
+        for queue in self.queues:
+            for key, item in queue.items():
+                if key in self.inflight:
+                    continue
+                chat = self._chat(key[0], now)
+                wait = max(chat["until"] - now, chat["bucket"].wait(now))
+                if wait <= 0:
+                    del queue[key]
+                    self.bucket.take()
+                    chat["bucket"].take()
+                    chat["used"] = now
+                    return item, key, 0
+                delay = wait if delay is None else min(delay, wait)
+        return None, None, delay
+
+    async def _run(self):
+        while True:
+            await self.slots.acquire()
+            self.wakeup.clear()
+            item, key, delay = self._next(time.monotonic())
+            if item is None:
+                self.slots.release()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self.inflight.add(key)
+            asyncio.create_task(self._send(key, item))
+
+    async def _send(self, key, item):
+        message, method, kwargs, future, priority = item
+        chat = self.chats.get(key[0])
+        try:
+            result = await getattr(message, method)(**kwargs)
+        except FloodWait as e:
+            self.counters["floods"] += 1
+            wait = e.value if isinstance(e.value, (int, float)) else 1
+            if chat:
+                chat["until"] = time.monotonic() + wait
+                chat["bucket"].slow_down()
+            self.bucket.slow_down(0.8)
+            # retry later unless a newer edit of the message is already waiting
+            if not any(key in queue for queue in self.queues):
+                self.queues[priority][key] = item
+            else:
+                self._resolve(future, None)
+        except MessageNotModified:
+            self.counters["unchanged"] += 1
+            self._resolve(future, None)
+        except Exception as e:
+            self.counters["failed"] += 1
+            LOGGER(__name__).debug(f"Edit {method} in {key[0]} failed: {e}")
+            self._resolve(future, None)
+        else:
+            self.counters["sent"] += 1
+            now = time.monotonic()
+            self.sent_at.append(now)
+            while now - self.sent_at[0] > 60:
+                self.sent_at.popleft()
+            if chat:
+                chat["bucket"].speed_up()
+            self.bucket.speed_up()
+            self._resolve(future, result)
+        finally:
+            self.inflight.discard(key)
+            self.slots.release()
+            self.wakeup.set()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        while self.sent_at and now - self.sent_at[0] > 60:
+            self.sent_at.popleft()
+        return {
+            **self.counters,
+            "pending": len(self.queues[FOREGROUND]) + len(self.queues[BACKGROUND]),
+            "foreground": len(self.queues[FOREGROUND]),
+            "inflight": len(self.inflight),
+            "sent_last_minute": len(self.sent_at),
+            "global_rate": round(self.bucket.rate, 2),
+            "slowed_chats": sum(
+                1 for chat in self.chats.values() if chat["bucket"].rate < chat["bucket"].base
+            ),
+        }
+
+
+edits = EditScheduler()
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -0,0 +1,183 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+import aiohttp
+
+import config
+
+from ..logging import LOGGER
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+IDEMPOTENT = ("GET", "HEAD", "OPTIONS")
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class HttpClient:
+    """
+    Process-wide aiohttp client: one pooled keep-alive session with DNS
+    caching, per-host connection limits, timeouts, retry with backoff and
+    request/latency/pool metrics.
+    """
+
+    def __init__(self):
+        self._session = None
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.saturated = 0
+        self.inflight = {}
+        self.hosts = {}
+        self.latency = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=config.HTTP_POOL_LIMIT,
+                limit_per_host=config.HTTP_POOL_PER_HOST,
+                ttl_dns_cache=300,
+                keepalive_timeout=30,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=None,
+                    sock_connect=10,
+                    sock_read=config.HTTP_TIMEOUT,
+                ),
+            )
+        return self._session
+
+    def _observe(self, host, elapsed, failed=False):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed <= bound:
+                self.latency[i] += 1
+                break
+        else:
+            self.latency[-1] += 1
+        stats = self.hosts.setdefault(host, {"requests": 0, "errors": 0, "time": 0.0})
+        stats["requests"] += 1
+        stats["time"] += elapsed
+        if failed:
+            stats["errors"] += 1
+            self.errors += 1
+
+    async def _send(self, method, url, retries, **kwargs):
+        method = method.upper()
+        host = urlsplit(url).hostname or ""
+        attempt = 0
+        while True:
+            self.requests += 1
+            start = time.monotonic()
+            try:
+                resp = await self.session.request(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                self._observe(host, time.monotonic() - start, failed=True)
+                safe = method in IDEMPOTENT or isinstance(
+                    e, aiohttp.ClientConnectorError
+                )
+                if not safe or attempt >= retries:
+                    raise
+            else:
+                failed = resp.status >= 500
+                self._observe(host, time.monotonic() - start, failed=failed)
+                if (
+                    resp.status not in RETRY_STATUS
+                    or method not in IDEMPOTENT
+                    or attempt >= retries
+                ):
+                    return resp
+                resp.release()
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(min(0.5 * 2**attempt, 8))
+
+    @asynccontextmanager
+    async def stream(self, method, url, retries=None, **kwargs):
+        """async with http.stream("GET", url) as resp: ... (body is not read)"""
+        host = urlsplit(url).hostname or ""
+        if self.inflight.get(host, 0) >= config.HTTP_POOL_PER_HOST:
+            self.saturated += 1
+        self.inflight[host] = self.inflight.get(host, 0) + 1
+        try:
+            resp = await self._send(
+                method,
+                url,
+                config.HTTP_RETRIES if retries is None else retries,
+                **kwargs,
+            )
+            try:
+                yield resp
+            finally:
+                resp.release()
+        finally:
+            self.inflight[host] -= 1
+
+    async def fetch(self, method, url, read="json", retries=None, **kwargs):
+        """Returns (status, body); `read` is one of json/text/bytes."""
+        async with self.stream(method, url, retries=retries, **kwargs) as resp:
+            if read == "json":
+                body = await resp.json(content_type=None)
+            elif read == "text":
+                body = await resp.text()
+            else:
+                body = await resp.read()
+            return resp.status, body
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "saturated": self.saturated,
+            "inflight": sum(self.inflight.values()),
+            "latency": dict(
+                zip([f"<={b}s" for b in LATENCY_BUCKETS] + ["inf"], self.latency)
+            ),
+            "hosts": self.hosts,
+        }
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            LOGGER(__name__).info("HTTP client closed.")
+
+
+http = HttpClient()
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -0,0 +1,298 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+
+import asyncio
+import importlib
+import itertools
+import os
+import secrets
+import shutil
+import sys
+import tempfile
+
+from ..logging import LOGGER
+from .assistant_worker import HELLO, TOKEN_ENV, TOKEN_SIZE, read_frame, write_frame
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assistant_worker.py")
+# PyTgCalls methods Call uses, forwarded as-is to the worker
+METHODS = (
+    "join_group_call",
+    "change_stream",
+    "leave_group_call",
+    "pause_stream",
+    "resume_stream",
+    "mute_stream",
+    "unmute_stream",
+    "get_participants",
+)
+# events that mean the assistant is no longer in the chat's call
+GONE = ("kicked", "closed", "left")
+READY_TIMEOUT = 120
+RESTART_DELAY = 5
+
+
+def load_error(module: str, name: str, args: tuple) -> Exception:
+    try:
+        cls = importlib.import_module(module)
+        for part in name.split("."):
+            cls = getattr(cls, part)
+    except Exception:
+        return RuntimeError(f"{module}.{name}: {args}")
+    try:
+        return cls(*args)
+    except Exception:
+        error = cls.__new__(cls)
+        error.args = args
+        return error
+
+
+class RemoteCalls:
+    """Stands in for the PyTgCalls instance of an assistant run by a worker."""
+
+    def __init__(self, worker, num: int):
+        self.worker = worker
+        self.num = num
+        self.handlers = {"kicked": [], "closed": [], "left": [], "stream_end": []}
+
+    def _on(self, kind):
+        def decorator(func):
+            self.handlers[kind].append(func)
+            return func
+
+        return decorator
+
+    def on_kicked(self):
+        return self._on("kicked")
+
+    def on_closed_voice_chat(self):
+        return self._on("closed")
+
+    def on_left(self):
+        return self._on("left")
+
+    def on_stream_end(self):
+        return self._on("stream_end")
+
+    @property
+    def ping(self):
+        return self.worker.request(self.num, "ping")
+
+    async def start(self):
+        await self.worker.wait_ready()
+
+    def __getattr__(self, name):
+        if name not in METHODS:
+            raise AttributeError(name)
+
+        async def method(*args, **kwargs):
+            return await self.worker.request(self.num, name, *args, **kwargs)
+
+        return method
+
+    def dispatch(self, kind, payload):
+        for handler in self.handlers[kind]:
+            asyncio.create_task(handler(self, payload))
+
+
+class Worker:
+    """One worker process and the connection to it."""
+
+    def __init__(self, pool, index: int, numbers: list):
+        self.pool = pool
+        self.index = index
+        self.numbers = numbers
+        self.proxies = {num: RemoteCalls(self, num) for num in numbers}
+        self.proc = None
+        self.writer = None
+        self.ready = asyncio.Event()
+        self.pending = {}
+        self.ids = itertools.count()
+        # chat_id -> assistant for calls this worker is in
+        self.chats = {}
+
+    async def wait_ready(self):
+        await asyncio.wait_for(self.ready.wait(), READY_TIMEOUT)
+
+    async def request(self, num, method, *args, **kwargs):
+        await self.wait_ready()
+        req_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[req_id] = future
+        try:
+            write_frame(self.writer, (req_id, num, method, args, kwargs))
+            await self.writer.drain()
+            ok, value = await future
+        finally:
+            self.pending.pop(req_id, None)
+        if not ok:
+            raise load_error(*value)
+        if method == "join_group_call":
+            self.chats[args[0]] = num
+        elif method == "leave_group_call":
+            self.chats.pop(args[0], None)
+        return value
+
+    async def supervise(self):
+        while not self.pool.closing:
+            self.proc = await asyncio.create_subprocess_exec(
+                sys.executable,
+                WORKER_SCRIPT,
+                self.pool.path,
+                str(self.index),
+                *map(str, self.numbers),
+                env={**os.environ, TOKEN_ENV: self.pool.token},
+            )
+            code = await self.proc.wait()
+            if self.pool.closing:
+                break
+            LOGGER(__name__).error(
+                f"Assistant worker {self.index} exited with {code}, restarting..."
+            )
+            await asyncio.sleep(RESTART_DELAY)
+
+    async def serve(self, reader, writer):
+        self.writer = writer
+        try:
+            while True:
+                frame = await read_frame(reader)
+                if frame[0] == "reply":
+                    _, req_id, ok, value = frame
+                    future = self.pending.get(req_id)
+                    if future and not future.done():
+                        future.set_result((ok, value))
+                elif frame[0] == "ready":
+                    self.ready.set()
+                    LOGGER(__name__).info(
+                        f"Assistant worker {self.index} serving {self.numbers}"
+                    )
+                elif frame[0] == "event":
+                    _, kind, num, payload = frame
+                    if kind in GONE:
+                        self.chats.pop(payload, None)
+                    self.proxies[num].dispatch(kind, payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.lost()
+
+    def lost(self):
+        self.ready.clear()
+        self.writer = None
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("assistant worker went away"))
+        # the calls died with the process, let Call clean their queues up
+        chats, self.chats = self.chats, {}
+        if not self.pool.closing:
+            for chat_id, num in chats.items():
+                self.proxies[num].dispatch("left", chat_id)
+
+
+class WorkerPool:
+    """
+    Runs the assistants' PyTgCalls in ASSISTANT_WORKERS child processes.
+    The bot process keeps the queues and talks to the workers over a
+    local unix socket, workers send stream-end and left events back.
+    """
+
+    def __init__(self):
+        self.workers = []
+        self.server = None
+        self.folder = None
+        self.path = None
+        self.token = secrets.token_hex(TOKEN_SIZE // 2)
+        self.closing = False
+        self.tasks = []
+
+    def proxies(self, numbers, count: int) -> dict:
+        if not numbers:
+            return {}
+        count = min(count, len(numbers))
+        groups = [numbers[i::count] for i in range(count)]
+        self.workers = [Worker(self, i, group) for i, group in enumerate(groups)]
+        return {
+            num: proxy
+            for worker in self.workers
+            for num, proxy in worker.proxies.items()
+        }
+
+    async def connected(self, reader, writer):
+        try:
+            token, index = HELLO.unpack(
+                await asyncio.wait_for(reader.readexactly(HELLO.size), 10)
+            )
+        except Exception:
+            writer.close()
+            return
+        if not secrets.compare_digest(token, self.token.encode()) or not (
+            0 <= index < len(self.workers)
+        ):
+            writer.close()
+            return
+        await self.workers[index].serve(reader, writer)
+        writer.close()
+
+    async def start(self):
+        if self.server or not self.workers:
+            return
+        self.folder = tempfile.mkdtemp(prefix="assistants-")
+        self.path = os.path.join(self.folder, "ipc.sock")
+        self.server = await asyncio.start_unix_server(self.connected, self.path)
+        self.tasks = [asyncio.create_task(w.supervise()) for w in self.workers]
+        await asyncio.gather(*(w.wait_ready() for w in self.workers))
+
+    async def stop(self):
+        self.closing = True
+        procs = []
+        for worker in self.workers:
+            if worker.writer:
+                worker.writer.close()
+            if worker.proc and worker.proc.returncode is None:
+                worker.proc.terminate()
+                procs.append(worker.proc.wait())
+        if procs:
+            await asyncio.wait_for(asyncio.gather(*procs), 10)
+        for task in self.tasks:
+            task.cancel()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.folder:
+            shutil.rmtree(self.folder, ignore_errors=True)
+
+
+workers = WorkerPool()
+
+
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -23,10 +23,11 @@
 import re
 from typing import Union
 
-import aiohttp
 from bs4 import BeautifulSoup
 from youtubesearchpython.__future__ import VideosSearch
 
+from ShrutiMusic.core.http import http
+
 
 class RessoAPI:
     def __init__(self):
@@ -42,11 +43,9 @@ class RessoAPI:
     async def track(self, url, playid: Union[bool, str] = None):
         if playid:
             url = self.base + url
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return False
-                html = await response.text()
+        status, html = await http.fetch("GET", url, read="text")
+        if status != 200:
+            return False
         soup = BeautifulSoup(html, "html.parser")
         for tag in soup.find_all("meta"):
             if tag.get("property", None) == "og:title":
@@ -29,6 +29,8 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Voice
 
 import config
 from ShrutiMusic import app
+from ShrutiMusic.core.edits import FOREGROUND, edits
+from ShrutiMusic.utils.stream.seekindex import schedule_index
 from ShrutiMusic.utils.formatters import (
     check_duration,
     convert_bytes,
@@ -119,6 +121,7 @@ class TeleAPI:
         checker = [5, 10, 20, 40, 66, 80, 99]
         speed_counter = {}
         if os.path.exists(fname):
+            schedule_index(fname)
             return True
 
         async def down_load():
@@ -155,21 +158,21 @@ class TeleAPI:
                     check = int(checker[counter])
                     if low < percentage <= high:
                         if high == check:
-                            try:
-                                await mystic.edit_text(
-                                    text=_["tg_1"].format(
-                                        app.mention,
-                                        total_size,
-                                        completed_size,
-                                        percentage[:5],
-                                        speed,
-                                        eta,
-                                    ),
-                                    reply_markup=upl,
-                                )
-                                checker[counter] = 100
-                            except:
-                                pass
+                            edits.submit(
+                                mystic,
+                                "edit_text",
+                                FOREGROUND,
+                                text=_["tg_1"].format(
+                                    app.mention,
+                                    total_size,
+                                    completed_size,
+                                    percentage,
+                                    speed,
+                                    eta,
+                                ),
+                                reply_markup=upl,
+                            )
+                            checker[counter] = 100
 
             speed_counter[message.id] = time.time()
             try:
@@ -184,9 +187,11 @@ class TeleAPI:
                     )
                 except:
                     elapsed = "0 sᴇᴄᴏɴᴅs"
-                await mystic.edit_text(_["tg_2"].format(elapsed))
+                await edits.submit(
+                    mystic, "edit_text", FOREGROUND, text=_["tg_2"].format(elapsed)
+                )
             except:
-                await mystic.edit_text(_["tg_3"])
+                await edits.submit(mystic, "edit_text", FOREGROUND, text=_["tg_3"])
 
         task = asyncio.create_task(down_load())
         config.lyrical[mystic.id] = task
@@ -195,6 +200,7 @@ class TeleAPI:
         if not verify:
             return False
         config.lyrical.pop(mystic.id)
+        schedule_index(fname)
         return True
 
 
@@ -1,38 +1,259 @@
 import asyncio
 import os
 import re
-import json
 from typing import Union
 import yt_dlp
 from pyrogram.enums import MessageEntityType
 from pyrogram.types import Message
 from youtubesearchpython.__future__ import VideosSearch
 from ShrutiMusic.utils.database import is_on_off
-from ShrutiMusic.utils.formatters import time_to_seconds
-import glob
-import random
-import logging
-import aiohttp
+from ShrutiMusic.utils.stream.cache import media_cache
+from ShrutiMusic.utils.stream.cookies import cookie_pool
+from ShrutiMusic.utils.stream.live import live_urls
+from ShrutiMusic.utils.stream.metadata import metadata, video_id_of
+from ShrutiMusic.utils.stream.singleflight import flights
+import copy
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from os import getenv
+import config
+from ShrutiMusic.core.http import http
 
 API_URL = getenv("API_URL", 'https://api.thequickearn.xyz')
 VIDEO_API_URL = getenv("VIDEO_API_URL", 'https://api.video.thequickearn.xyz')
 API_KEY = getenv("API_KEY", None)
 
-def cookie_txt_file():
-    cookie_dir = "ShrutiMusic/cookies"
-    if not os.path.exists(cookie_dir):
-        return None
-    cookies_files = [f for f in os.listdir(cookie_dir) if f.endswith(".txt")]
-    if not cookies_files:
+def get_video_id(link: str):
+    return link.split('v=')[-1].split('&')[0]
+
+HEDGE_MIN_DELAY = 1.0
+HEDGE_MAX_DELAY = 15.0
+
+backend_stats = {
+    "api": {"ok": 0, "fail": 0, "wins": 0, "avg": None, "dev": 0.0},
+    "cookies": {"ok": 0, "fail": 0, "wins": 0, "avg": None, "dev": 0.0},
+}
+
+def record_backend(name: str, latency: float, ok: bool):
+    """Keep an EWMA of successful latency (and its deviation) per backend"""
+    stats = backend_stats[name]
+    if not ok:
+        stats["fail"] += 1
+        return
+    stats["ok"] += 1
+    if stats["avg"] is None:
+        stats["avg"] = latency
+        stats["dev"] = latency / 2
+    else:
+        stats["dev"] = 0.75 * stats["dev"] + 0.25 * abs(latency - stats["avg"])
+        stats["avg"] = 0.875 * stats["avg"] + 0.125 * latency
+
+def hedge_delay() -> float:
+    """How long the API gets on its own before the cookies backend is started"""
+    if config.DOWNLOAD_HEDGE_DELAY != "auto":
+        try:
+            return max(0.0, float(config.DOWNLOAD_HEDGE_DELAY))
+        except ValueError:
+            pass
+    api = backend_stats["api"]
+    if api["avg"] is None:
+        return 4.0
+    delay = api["avg"] + 2 * api["dev"]
+    return min(max(delay, HEDGE_MIN_DELAY), HEDGE_MAX_DELAY)
+
+def live_stream_url(link: str) -> str:
+    """
+    Blocking, run in an executor: the HLS/DASH url of a live stream. Live
+    content never goes through the download backends, it can't finish.
+    """
+    ydl_opts = {
+        "format": "best[height<=?720][width<=?1280]",
+        "quiet": True,
+        "no_warnings": True,
+        "noplaylist": True,
+    }
+    with cookie_pool.lease() as cookie_file:
+        if cookie_file:
+            ydl_opts["cookiefile"] = cookie_file
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(link, download=False)
+    url = info.get("url") or info.get("manifest_url")
+    if not url:
+        raise ValueError(f"No playable url for {link}")
+    return url
+
+async def stream_url_cookies(link: str):
+    """
+    `yt-dlp -g` with a pooled cookie. Returns (url, None) or (None, error);
+    the cookie goes back to the pool however the subprocess ends.
+    """
+    cookie_file = cookie_pool.acquire()
+    if not cookie_file:
+        return None, "No cookies found. Cannot download video."
+    started = time.monotonic()
+    stdout, error = b"", None
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "yt-dlp",
+            "--cookies", cookie_file,
+            "-g",
+            "-f",
+            "best[height<=?720][width<=?1280]",
+            f"{link}",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await proc.communicate()
+        error = stderr.decode()
+    finally:
+        cookie_pool.release(cookie_file, bool(stdout), time.monotonic() - started, error)
+    if stdout:
+        return stdout.decode().split("\n")[0], None
+    return None, error
+
+INFO_CACHE_TTL = 1800
+INFO_CACHE_SIZE = 256
+info_cache = {}
+# extract_cached runs on executor threads
+info_lock = threading.Lock()
+
+def extract_cached(ydl, link: str):
+    """
+    Raw (unprocessed) yt-dlp metadata for `link`, cached per video id.
+    Every caller gets its own copy so format selection can run on it freely.
+    """
+    video_id = get_video_id(link)
+    now = time.time()
+    with info_lock:
+        hit = info_cache.get(video_id)
+    if hit and hit[0] > now:
+        return copy.deepcopy(hit[1])
+    info = ydl.extract_info(link, download=False, process=False)
+    with info_lock:
+        if len(info_cache) >= INFO_CACHE_SIZE:
+            for key in [k for k, v in info_cache.items() if v[0] <= now]:
+                info_cache.pop(key, None)
+            if len(info_cache) >= INFO_CACHE_SIZE:
+                info_cache.pop(next(iter(info_cache)), None)
+        info_cache[video_id] = (now + INFO_CACHE_TTL, info)
+    return copy.deepcopy(info)
+
+def ytdl_fetch(link: str, ydl_opts: dict, exts):
+    """
+    Blocking, run in an executor: one metadata extraction is reused for the
+    existence check, the download and the final path resolution. Both
+    backends download into .part files, a final path only exists complete.
+    """
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = extract_cached(ydl, link)
+        video_id = info.get("id") or get_video_id(link)
+        for ext in exts:
+            file_path = f"downloads/{video_id}.{ext}"
+            if os.path.exists(file_path):
+                return file_path
+        result = ydl.process_ie_result(info, download=True)
+        downloads = result.get("requested_downloads") or [{}]
+        file_path = downloads[0].get("filepath") or ydl.prepare_filename(result)
+        if os.path.exists(file_path):
+            return file_path
+    return None
+
+def abort_hook(cancel, partials):
+    """yt-dlp progress hook that aborts the download once `cancel` is set"""
+    def _hook(d):
+        if d.get("tmpfilename"):
+            partials.add(d["tmpfilename"])
+        if cancel is not None and cancel.is_set():
+            raise yt_dlp.utils.DownloadCancelled("Lost the download race")
+
+    return _hook
+
+def remove_partials(partials):
+    for path in partials:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+async def save_response(file_response, file_path: str, key):
+    """
+    Stream a response into a .part file of the API's own and move it into
+    place only when complete, so the final path never holds a partial file
+    and a cancelled API download removes nothing but its own temp file.
+    """
+    temp_path = f"{file_path}.api.part"
+    total = file_response.content_length
+    done = 0
+    try:
+        with open(temp_path, "wb") as f:
+            async for chunk in file_response.content.iter_chunked(8192):
+                f.write(chunk)
+                done += len(chunk)
+                flights.report(key, done, total)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return file_path
+
+async def race_backends(link: str, api_func, cookies_func):
+    """
+    Hedged download: start the API, start cookies as well if the API has not
+    finished within hedge_delay(), return the first valid file and cancel the loser.
+    """
+    cancel = threading.Event()
+    names = {}
+    started = {}
+
+    def launch(name, coro):
+        task = asyncio.create_task(coro)
+        names[task] = name
+        started[task] = time.monotonic()
+        return task
+
+    pending = {launch("api", api_func(link))}
+    delay = hedge_delay()
+    hedged = False
+    winner = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=None if hedged else delay,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                result = None if task.exception() else task.result()
+                ok = bool(result) and os.path.exists(result)
+                record_backend(names[task], time.monotonic() - started[task], ok)
+                if ok and winner is None:
+                    winner = (names[task], result)
+            if winner:
+                break
+            if not hedged:
+                hedged = True
+                pending.add(launch("cookies", cookies_func(link, cancel)))
+    finally:
+        cancel.set()
+        for task in pending:
+            # yt-dlp runs in a thread: the cookies task stops itself on `cancel`
+            # and removes its partial files, so only the API task is cancelled.
+            if names[task] == "api":
+                task.cancel()
+    if not winner:
         return None
-    cookie_file = os.path.join(cookie_dir, random.choice(cookies_files))
-    return cookie_file
+    backend_stats[winner[0]]["wins"] += 1
+    return winner
 
 async def download_song_api(link: str):
     """Download song using API"""
     try:
-        video_id = link.split('v=')[-1].split('&')[0]
+        video_id = get_video_id(link)
         download_folder = "downloads"
         
         for ext in ["mp3", "m4a", "webm"]:
@@ -41,88 +262,71 @@ async def download_song_api(link: str):
                 return file_path
         
         song_url = f"{API_URL}/song/{video_id}?api={API_KEY}"
-        async with aiohttp.ClientSession() as session:
-            for attempt in range(10):
-                try:
-                    async with session.get(song_url) as response:
-                        if response.status != 200:
-                            continue
-                    
-                        data = await response.json()
-                        status = data.get("status", "").lower()
-
-                        if status == "done":
-                            download_url = data.get("link")
-                            if not download_url:
-                                continue
-                            break
-                        elif status == "downloading":
-                            await asyncio.sleep(4)
-                        else:
+        for attempt in range(10):
+            try:
+                async with http.stream("GET", song_url) as response:
+                    if response.status != 200:
+                        continue
+                
+                    data = await response.json()
+                    status = data.get("status", "").lower()
+
+                    if status == "done":
+                        download_url = data.get("link")
+                        if not download_url:
                             continue
-                except Exception:
-                    continue
-            else:
-                return None
+                        break
+                    elif status == "downloading":
+                        await asyncio.sleep(4)
+                    else:
+                        continue
+            except Exception:
+                continue
+        else:
+            return None
 
-            file_format = data.get("format", "mp3")
-            file_extension = file_format.lower()
-            file_name = f"{video_id}.{file_extension}"
-            os.makedirs(download_folder, exist_ok=True)
-            file_path = os.path.join(download_folder, file_name)
+        file_format = data.get("format", "mp3")
+        file_extension = file_format.lower()
+        file_name = f"{video_id}.{file_extension}"
+        os.makedirs(download_folder, exist_ok=True)
+        file_path = os.path.join(download_folder, file_name)
 
-            async with session.get(download_url) as file_response:
-                if file_response.status != 200:
-                    return None
-                with open(file_path, 'wb') as f:
-                    async for chunk in file_response.content.iter_chunked(8192):
-                        f.write(chunk)
-            return file_path
+        async with http.stream("GET", download_url) as file_response:
+            if file_response.status != 200:
+                return None
+            return await save_response(file_response, file_path, (video_id, "audio"))
     except Exception as e:
         print(f"API Song Error: {e}")
         return None
 
-async def download_song_cookies(link: str):
+async def download_song_cookies(link: str, cancel=None):
     """Download song using cookies"""
+    partials = set()
     try:
-        cookie_file = cookie_txt_file()
-        if not cookie_file:
-            return None
-        
-        ydl_opts = {
-            "format": "bestaudio/best",
-            "outtmpl": "downloads/%(id)s.%(ext)s",
-            "geo_bypass": True,
-            "nocheckcertificate": True,
-            "quiet": True,
-            "cookiefile": cookie_file,
-            "no_warnings": True,
-        }
-        
-        loop = asyncio.get_running_loop()
-        
-        def _download():
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(link, download=False)
-                video_id = info['id']
-                
-                for ext in ["webm", "m4a", "mp3"]:
-                    file_path = f"downloads/{video_id}.{ext}"
-                    if os.path.exists(file_path):
-                        return file_path
-                
-                return ydl.download([link])
+        with cookie_pool.lease() as cookie_file:
+            if not cookie_file:
+                return None
         
-        result = await loop.run_in_executor(None, _download)
+            ydl_opts = {
+                "format": "bestaudio/best",
+                "outtmpl": "downloads/%(id)s.%(ext)s",
+                "geo_bypass": True,
+                "nocheckcertificate": True,
+                "quiet": True,
+                "cookiefile": cookie_file,
+                "no_warnings": True,
+                "progress_hooks": [
+                    flights.hook((get_video_id(link), "audio")),
+                    abort_hook(cancel, partials),
+                ],
+            }
         
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(link, download=False)
-            video_id = info['id']
-            ext = info['ext']
-            file_path = f"downloads/{video_id}.{ext}"
-            
-            if os.path.exists(file_path):
-                return file_path
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, ytdl_fetch, link, ydl_opts, ["webm", "m4a", "mp3"]
+            )
+    except yt_dlp.utils.DownloadCancelled:
+        remove_partials(partials)
         return None
     except Exception as e:
         print(f"Cookies Song Error: {e}")
@@ -131,7 +335,7 @@ async def download_song_cookies(link: str):
 async def download_video_api(link: str):
     """Download video using API"""
     try:
-        video_id = link.split('v=')[-1].split('&')[0]
+        video_id = get_video_id(link)
         download_folder = "downloads"
         
         for ext in ["mp4", "webm", "mkv"]:
@@ -140,123 +344,108 @@ async def download_video_api(link: str):
                 return file_path
         
         video_url = f"{VIDEO_API_URL}/video/{video_id}?api={API_KEY}"
-        async with aiohttp.ClientSession() as session:
-            for attempt in range(10):
-                try:
-                    async with session.get(video_url) as response:
-                        if response.status != 200:
-                            continue
-                    
-                        data = await response.json()
-                        status = data.get("status", "").lower()
-
-                        if status == "done":
-                            download_url = data.get("link")
-                            if not download_url:
-                                continue
-                            break
-                        elif status == "downloading":
-                            await asyncio.sleep(8)
-                        else:
+        for attempt in range(10):
+            try:
+                async with http.stream("GET", video_url) as response:
+                    if response.status != 200:
+                        continue
+                
+                    data = await response.json()
+                    status = data.get("status", "").lower()
+
+                    if status == "done":
+                        download_url = data.get("link")
+                        if not download_url:
                             continue
-                except Exception:
-                    continue
-            else:
-                return None
+                        break
+                    elif status == "downloading":
+                        await asyncio.sleep(8)
+                    else:
+                        continue
+            except Exception:
+                continue
+        else:
+            return None
 
-            file_format = data.get("format", "mp4")
-            file_extension = file_format.lower()
-            file_name = f"{video_id}.{file_extension}"
-            os.makedirs(download_folder, exist_ok=True)
-            file_path = os.path.join(download_folder, file_name)
+        file_format = data.get("format", "mp4")
+        file_extension = file_format.lower()
+        file_name = f"{video_id}.{file_extension}"
+        os.makedirs(download_folder, exist_ok=True)
+        file_path = os.path.join(download_folder, file_name)
 
-            async with session.get(download_url) as file_response:
-                if file_response.status != 200:
-                    return None
-                with open(file_path, 'wb') as f:
-                    async for chunk in file_response.content.iter_chunked(8192):
-                        f.write(chunk)
-            return file_path
+        async with http.stream("GET", download_url) as file_response:
+            if file_response.status != 200:
+                return None
+            return await save_response(file_response, file_path, (video_id, "video"))
     except Exception as e:
         print(f"API Video Error: {e}")
         return None
 
-async def download_video_cookies(link: str):
+async def download_video_cookies(link: str, cancel=None):
     """Download video using cookies"""
+    partials = set()
     try:
-        cookie_file = cookie_txt_file()
-        if not cookie_file:
-            return None
-        
-        ydl_opts = {
-            "format": "(bestvideo[height<=?720][width<=?1280][ext=mp4])+(bestaudio[ext=m4a])/best[height<=?720]",
-            "outtmpl": "downloads/%(id)s.%(ext)s",
-            "geo_bypass": True,
-            "nocheckcertificate": True,
-            "quiet": True,
-            "cookiefile": cookie_file,
-            "no_warnings": True,
-        }
-        
-        loop = asyncio.get_running_loop()
-        
-        def _download():
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(link, download=False)
-                video_id = info['id']
-                
-                for ext in ["mp4", "webm", "mkv"]:
-                    file_path = f"downloads/{video_id}.{ext}"
-                    if os.path.exists(file_path):
-                        return file_path
-                
-                return ydl.download([link])
+        with cookie_pool.lease() as cookie_file:
+            if not cookie_file:
+                return None
         
-        result = await loop.run_in_executor(None, _download)
+            ydl_opts = {
+                "format": "(bestvideo[height<=?720][width<=?1280][ext=mp4])+(bestaudio[ext=m4a])/best[height<=?720]",
+                "outtmpl": "downloads/%(id)s.%(ext)s",
+                "geo_bypass": True,
+                "nocheckcertificate": True,
+                "quiet": True,
+                "cookiefile": cookie_file,
+                "no_warnings": True,
+                "progress_hooks": [
+                    flights.hook((get_video_id(link), "video")),
+                    abort_hook(cancel, partials),
+                ],
+            }
         
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(link, download=False)
-            video_id = info['id']
-            ext = info['ext']
-            file_path = f"downloads/{video_id}.{ext}"
-            
-            if os.path.exists(file_path):
-                return file_path
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, ytdl_fetch, link, ydl_opts, ["mp4", "webm", "mkv"]
+            )
+    except yt_dlp.utils.DownloadCancelled:
+        remove_partials(partials)
         return None
     except Exception as e:
         print(f"Cookies Video Error: {e}")
         return None
 
-async def download_song_combined(link: str):
-    """Try both API and cookies for song download, whichever responds first"""
+async def download_song_combined(link: str, mystic=None):
+    """Download a song once, even when several chats request it at the same time"""
+    return await flights.run(
+        (get_video_id(link), "audio"), _download_song_combined, link, mystic=mystic
+    )
+
+async def download_video_combined(link: str, mystic=None):
+    """Download a video once, even when several chats request it at the same time"""
+    return await flights.run(
+        (get_video_id(link), "video"), _download_video_combined, link, mystic=mystic
+    )
+
+async def _download_song_combined(link: str):
+    """Race API and cookies for song download, whichever responds first wins"""
     print("🔊 Starting combined song download...")
     
-    api_result = await download_song_api(link)
-    if api_result:
-        print("✅ Song downloaded via API")
-        return api_result
-    
-    cookies_result = await download_song_cookies(link)
-    if cookies_result:
-        print("✅ Song downloaded via Cookies")
-        return cookies_result
+    winner = await race_backends(link, download_song_api, download_song_cookies)
+    if winner:
+        print(f"✅ Song downloaded via {winner[0]}")
+        return winner[1]
     
     print("❌ Both methods failed for song download")
     return None
 
-async def download_video_combined(link: str):
-    """Try both API and cookies for video download, whichever responds first"""
+async def _download_video_combined(link: str):
+    """Race API and cookies for video download, whichever responds first wins"""
     print("🎥 Starting combined video download...")
     
-    api_result = await download_video_api(link)
-    if api_result:
-        print("✅ Video downloaded via API")
-        return api_result
-    
-    cookies_result = await download_video_cookies(link)
-    if cookies_result:
-        print("✅ Video downloaded via Cookies")
-        return cookies_result
+    winner = await race_backends(link, download_video_api, download_video_cookies)
+    if winner:
+        print(f"✅ Video downloaded via {winner[0]}")
+        return winner[1]
     
     print("❌ Both methods failed for video download")
     return None
@@ -264,28 +453,22 @@ async def download_video_combined(link: str):
 async def check_file_size(link):
     """Check file size using cookies"""
     async def get_format_info(link):
-        cookie_file = cookie_txt_file()
-        if not cookie_file:
-            return None
-            
-        proc = await asyncio.create_subprocess_exec(
-            "yt-dlp",
-            "--cookies", cookie_file,
-            "-J",
-            link,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await proc.communicate()
-        if proc.returncode != 0:
+        def _extract():
+            with cookie_pool.lease() as cookie_file:
+                if not cookie_file:
+                    return None
+                with yt_dlp.YoutubeDL({"quiet": True, "cookiefile": cookie_file}) as ydl:
+                    return extract_cached(ydl, link)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, _extract)
+        except Exception:
             return None
-        return json.loads(stdout.decode())
 
     def parse_size(formats):
         total_size = 0
         for format in formats:
-            if 'filesize' in format:
-                total_size += format['filesize']
+            total_size += format.get('filesize') or 0
         return total_size
 
     info = await get_format_info(link)
@@ -299,20 +482,71 @@ async def check_file_size(link):
     total_size = parse_size(formats)
     return total_size
 
-async def shell_cmd(cmd):
-    """Execute shell command"""
-    proc = await asyncio.create_subprocess_shell(
-        cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    out, errorz = await proc.communicate()
-    if errorz:
-        if "unavailable videos are hidden" in (errorz.decode("utf-8")).lower():
-            return out.decode("utf-8")
-        else:
-            return errorz.decode("utf-8")
-    return out.decode("utf-8")
+PLAYLIST_CACHE_TTL = 600
+PLAYLIST_CACHE_SIZE = 128
+playlist_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="playlist")
+# link -> {"expires", "ids" (contiguous from the start), "complete"}
+playlist_cache = {}
+
+def flat_playlist(link: str, start: int, stop: int, push, cancel):
+    """
+    Blocking, run in playlist_pool: walk the flat playlist in-process and
+    push ids `start`..`stop` one by one as yt-dlp pages through it.
+    """
+    opts = {"quiet": True, "extract_flat": "in_playlist", "skip_download": True}
+    with cookie_pool.lease() as cookie_file:
+        if cookie_file:
+            opts["cookiefile"] = cookie_file
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            info = ydl.extract_info(link, download=False, process=False)
+            if info.get("_type") in ("url", "url_transparent"):
+                info = ydl.extract_info(info["url"], download=False, process=False)
+            for entry in itertools.islice(info.get("entries") or [], start, stop):
+                if cancel.is_set():
+                    return
+                if entry and entry.get("id"):
+                    push(entry["id"])
+
+async def extract_playlist(link: str, start: int, stop: int):
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    cancel = threading.Event()
+    done = object()
+
+    def push(item):
+        loop.call_soon_threadsafe(queue.put_nowait, item)
+
+    def work():
+        try:
+            flat_playlist(link, start, stop, push, cancel)
+        finally:
+            push(done)
+
+    future = loop.run_in_executor(playlist_pool, work)
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            yield item
+        await future
+    finally:
+        cancel.set()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+def cached_playlist(link: str) -> dict:
+    now = time.time()
+    entry = playlist_cache.get(link)
+    if entry and entry["expires"] > now:
+        return entry
+    if len(playlist_cache) >= PLAYLIST_CACHE_SIZE:
+        for key in [k for k, v in playlist_cache.items() if v["expires"] <= now]:
+            playlist_cache.pop(key, None)
+        if len(playlist_cache) >= PLAYLIST_CACHE_SIZE:
+            playlist_cache.pop(next(iter(playlist_cache)), None)
+    entry = {"expires": now + PLAYLIST_CACHE_TTL, "ids": [], "complete": False}
+    playlist_cache[link] = entry
+    return entry
 
 class YouTubeAPI:
     def __init__(self):
@@ -354,52 +588,28 @@ class YouTubeAPI:
             return None
         return text[offset : offset + length]
 
-    async def details(self, link: str, videoid: Union[bool, str] = None):
+    async def _meta(self, link: str, videoid: Union[bool, str] = None) -> dict:
         if videoid:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-            vidid = result["id"]
-            if str(duration_min) == "None":
-                duration_sec = 0
-            else:
-                duration_sec = int(time_to_seconds(duration_min))
-        return title, duration_min, duration_sec, thumbnail, vidid
+        meta = await metadata.lookup(link)
+        if meta is None:
+            raise ValueError(f"No YouTube result for {link}")
+        return meta
+
+    async def details(self, link: str, videoid: Union[bool, str] = None):
+        meta = await self._meta(link, videoid)
+        return meta["title"], meta["duration"], meta["duration_sec"], meta["thumb"], meta["id"]
 
     async def title(self, link: str, videoid: Union[bool, str] = None):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-        return title
+        return (await self._meta(link, videoid))["title"]
 
     async def duration(self, link: str, videoid: Union[bool, str] = None):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            duration = result["duration"]
-        return duration
+        return (await self._meta(link, videoid))["duration"]
 
     async def thumbnail(self, link: str, videoid: Union[bool, str] = None):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-        return thumbnail
+        return (await self._meta(link, videoid))["thumb"]
 
     async def video(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
@@ -411,68 +621,68 @@ class YouTubeAPI:
         if downloaded_file:
             return 1, downloaded_file
         
-        cookie_file = cookie_txt_file()
-        if not cookie_file:
-            return 0, "No cookies found. Cannot download video."
-            
-        proc = await asyncio.create_subprocess_exec(
-            "yt-dlp",
-            "--cookies", cookie_file,
-            "-g",
-            "-f",
-            "best[height<=?720][width<=?1280]",
-            f"{link}",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await proc.communicate()
-        if stdout:
-            return 1, stdout.decode().split("\n")[0]
+        url, error = await stream_url_cookies(link)
+        if url:
+            return 1, url
         else:
-            return 0, stderr.decode()
+            return 0, error
 
-    async def playlist(self, link, limit, user_id, videoid: Union[bool, str] = None):
+    async def live(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
-            link = self.listbase + link
+            link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        
-        cookie_file = cookie_txt_file()
-        if not cookie_file:
-            return []
-            
-        playlist = await shell_cmd(
-            f"yt-dlp -i --get-id --flat-playlist --cookies {cookie_file} --playlist-end {limit} --skip-download {link}"
-        )
-        try:
-            result = playlist.split("\n")
-            for key in result:
-                if key == "":
-                    result.remove(key)
-        except:
-            result = []
-        return result
+        vidid = video_id_of(link) or get_video_id(link)
 
-    async def track(self, link: str, videoid: Union[bool, str] = None):
+        async def fetch(vidid):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, live_stream_url, self.base + vidid)
+
+        try:
+            return 1, await live_urls.get(vidid, fetch)
+        except Exception as e:
+            return 0, str(e)
+
+    async def playlist_ids(self, link, limit, start: int = 0, videoid: Union[bool, str] = None):
+        """
+        Video ids `start`..`start + limit` of a playlist, yielded as soon as
+        yt-dlp reaches them. Ids seen before come from the cache, and a
+        later page only extracts what was not fetched yet.
+        """
         if videoid:
-            link = self.base + link
+            link = self.listbase + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            duration_min = result["duration"]
-            vidid = result["id"]
-            yturl = result["link"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
+        stop = start + limit
+        entry = cached_playlist(link)
+        ids = entry["ids"]
+        for vid in ids[start:stop]:
+            yield vid
+        index = len(ids)
+        if index >= stop or entry["complete"]:
+            return
+        async for vid in extract_playlist(link, index, stop):
+            if len(ids) == index:
+                ids.append(vid)
+            if index >= start:
+                yield vid
+            index += 1
+        if index < stop:
+            entry["complete"] = True
+
+    async def playlist(self, link, limit, user_id, videoid: Union[bool, str] = None):
+        return [vid async for vid in self.playlist_ids(link, limit, videoid=videoid)]
+
+    async def track(self, link: str, videoid: Union[bool, str] = None):
+        meta = await self._meta(link, videoid)
         track_details = {
-            "title": title,
-            "link": yturl,
-            "vidid": vidid,
-            "duration_min": duration_min,
-            "thumb": thumbnail,
+            "title": meta["title"],
+            "link": meta["link"],
+            "vidid": meta["id"],
+            "duration_min": meta["duration"],
+            "thumb": meta["thumb"],
         }
-        return track_details, vidid
+        return track_details, meta["id"]
 
     async def formats(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
@@ -480,39 +690,42 @@ class YouTubeAPI:
         if "&" in link:
             link = link.split("&")[0]
         
-        cookie_file = cookie_txt_file()
-        if not cookie_file:
+        def _extract():
+            with cookie_pool.lease() as cookie_file:
+                if not cookie_file:
+                    return None
+                ytdl_opts = {"quiet": True, "cookiefile": cookie_file}
+                with yt_dlp.YoutubeDL(ytdl_opts) as ydl:
+                    return ydl.process_ie_result(extract_cached(ydl, link), download=False)
+
+        r = await asyncio.get_running_loop().run_in_executor(None, _extract)
+        if r is None:
             return [], link
-            
-        ytdl_opts = {"quiet": True, "cookiefile": cookie_file}
-        ydl = yt_dlp.YoutubeDL(ytdl_opts)
-        with ydl:
-            formats_available = []
-            r = ydl.extract_info(link, download=False)
-            for format in r["formats"]:
+        formats_available = []
+        for format in r["formats"]:
+            try:
+                str(format["format"])
+            except:
+                continue
+            if not "dash" in str(format["format"]).lower():
                 try:
-                    str(format["format"])
+                    format["format"]
+                    format["filesize"]
+                    format["format_id"]
+                    format["ext"]
+                    format["format_note"]
                 except:
                     continue
-                if not "dash" in str(format["format"]).lower():
-                    try:
-                        format["format"]
-                        format["filesize"]
-                        format["format_id"]
-                        format["ext"]
-                        format["format_note"]
-                    except:
-                        continue
-                    formats_available.append(
-                        {
-                            "format": format["format"],
-                            "filesize": format["filesize"],
-                            "format_id": format["format_id"],
-                            "ext": format["ext"],
-                            "format_note": format["format_note"],
-                            "yturl": link,
-                        }
-                    )
+                formats_available.append(
+                    {
+                        "format": format["format"],
+                        "filesize": format["filesize"],
+                        "format_id": format["format_id"],
+                        "ext": format["ext"],
+                        "format_note": format["format_note"],
+                        "yturl": link,
+                    }
+                )
         return formats_available, link
 
     async def slider(
@@ -527,6 +740,7 @@ class YouTubeAPI:
             link = link.split("&")[0]
         a = VideosSearch(link, limit=10)
         result = (await a.next()).get("result")
+        metadata.seed(result[query_type])
         title = result[query_type]["title"]
         duration_min = result[query_type]["duration"]
         vidid = result[query_type]["id"]
@@ -545,56 +759,57 @@ class YouTubeAPI:
         title: Union[bool, str] = None,
     ) -> str:
         if videoid:
+            vidid = link
             link = self.base + link
+        else:
+            vidid = get_video_id(link)
         
         loop = asyncio.get_running_loop()
         
         def song_video_dl():
-            cookie_file = cookie_txt_file()
-            if not cookie_file:
-                raise Exception("No cookies found. Cannot download song video.")
-                
-            formats = f"{format_id}+140"
-            fpath = f"downloads/{title}"
-            ydl_optssx = {
-                "format": formats,
-                "outtmpl": fpath,
-                "geo_bypass": True,
-                "nocheckcertificate": True,
-                "quiet": True,
-                "no_warnings": True,
-                "cookiefile": cookie_file,
-                "prefer_ffmpeg": True,
-                "merge_output_format": "mp4",
-            }
-            x = yt_dlp.YoutubeDL(ydl_optssx)
-            x.download([link])
+            with cookie_pool.lease() as cookie_file:
+                if not cookie_file:
+                    raise Exception("No cookies found. Cannot download song video.")
+                formats = f"{format_id}+140"
+                fpath = f"downloads/{title}"
+                ydl_optssx = {
+                    "format": formats,
+                    "outtmpl": fpath,
+                    "geo_bypass": True,
+                    "nocheckcertificate": True,
+                    "quiet": True,
+                    "no_warnings": True,
+                    "cookiefile": cookie_file,
+                    "prefer_ffmpeg": True,
+                    "merge_output_format": "mp4",
+                }
+                with yt_dlp.YoutubeDL(ydl_optssx) as x:
+                    x.process_ie_result(extract_cached(x, link), download=True)
 
         def song_audio_dl():
-            cookie_file = cookie_txt_file()
-            if not cookie_file:
-                raise Exception("No cookies found. Cannot download song audio.")
-                
-            fpath = f"downloads/{title}.%(ext)s"
-            ydl_optssx = {
-                "format": format_id,
-                "outtmpl": fpath,
-                "geo_bypass": True,
-                "nocheckcertificate": True,
-                "quiet": True,
-                "no_warnings": True,
-                "cookiefile": cookie_file,
-                "prefer_ffmpeg": True,
-                "postprocessors": [
-                    {
-                        "key": "FFmpegExtractAudio",
-                        "preferredcodec": "mp3",
-                        "preferredquality": "192",
-                    }
-                ],
-            }
-            x = yt_dlp.YoutubeDL(ydl_optssx)
-            x.download([link])
+            with cookie_pool.lease() as cookie_file:
+                if not cookie_file:
+                    raise Exception("No cookies found. Cannot download song audio.")
+                fpath = f"downloads/{title}.%(ext)s"
+                ydl_optssx = {
+                    "format": format_id,
+                    "outtmpl": fpath,
+                    "geo_bypass": True,
+                    "nocheckcertificate": True,
+                    "quiet": True,
+                    "no_warnings": True,
+                    "cookiefile": cookie_file,
+                    "prefer_ffmpeg": True,
+                    "postprocessors": [
+                        {
+                            "key": "FFmpegExtractAudio",
+                            "preferredcodec": "mp3",
+                            "preferredquality": "192",
+                        }
+                    ],
+                }
+                with yt_dlp.YoutubeDL(ydl_optssx) as x:
+                    x.process_ie_result(extract_cached(x, link), download=True)
 
         if songvideo:
             await loop.run_in_executor(None, song_video_dl)
@@ -605,29 +820,19 @@ class YouTubeAPI:
             fpath = f"downloads/{title}.mp3"
             return fpath
         elif video:
-            downloaded_file = await download_video_combined(link)
+            cached = media_cache.get(vidid, video=True)
+            if cached:
+                return cached, True
+            downloaded_file = await download_video_combined(link, mystic)
             if downloaded_file:
                 direct = True
-                return downloaded_file, direct
+                return media_cache.put(vidid, True, downloaded_file), direct
             
             if not await is_on_off(1):
-                cookie_file = cookie_txt_file()
-                if cookie_file:
-                    proc = await asyncio.create_subprocess_exec(
-                        "yt-dlp",
-                        "--cookies", cookie_file,
-                        "-g",
-                        "-f",
-                        "best[height<=?720][width<=?1280]",
-                        f"{link}",
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                    )
-                    stdout, stderr = await proc.communicate()
-                    if stdout:
-                        downloaded_file = stdout.decode().split("\n")[0]
-                        direct = False
-                        return downloaded_file, direct
+                downloaded_file, error = await stream_url_cookies(link)
+                if downloaded_file:
+                    direct = False
+                    return downloaded_file, direct
             
             file_size = await check_file_size(link)
             if file_size:
@@ -636,10 +841,13 @@ class YouTubeAPI:
                     cookies_result = await download_video_cookies(link)
                     if cookies_result:
                         direct = True
-                        return cookies_result, direct
+                        return media_cache.put(vidid, True, cookies_result), direct
             
             return None, None
         else:
             direct = True
-            downloaded_file = await download_song_combined(link)
-            return downloaded_file, direct
+            cached = media_cache.get(vidid, video=False)
+            if cached:
+                return cached, direct
+            downloaded_file = await download_song_combined(link, mystic)
+            return media_cache.put(vidid, False, downloaded_file), direct
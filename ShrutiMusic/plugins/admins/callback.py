@@ -41,9 +41,13 @@ from ShrutiMusic.utils.database import (
 )
 from ShrutiMusic.utils.decorators.language import languageCB
 from ShrutiMusic.utils.formatters import seconds_to_min
+from ShrutiMusic.core.edits import edits
 from ShrutiMusic.utils.inline import close_markup, stream_markup, stream_markup_timer
 from ShrutiMusic.utils.inline.help import help_pannel_page1, help_pannel_page2, help_pannel_page3, help_pannel_page4
 from ShrutiMusic.utils.stream.autoclear import auto_clean
+from ShrutiMusic.utils.stream.live import live_urls
+from ShrutiMusic.utils.stream.position import get_played, set_played
+from ShrutiMusic.utils.stream.speed import reset_speed
 from ShrutiMusic.utils.thumbnails import gen_thumb
 from config import (
     BANNED_USERS,
@@ -438,16 +442,11 @@ async def del_back_playlist(client, CallbackQuery, _):
         videoid = check[0]["vidid"]
         status = True if str(streamtype) == "video" else None
         
-        db[chat_id][0]["played"] = 0
-        exis = (check[0]).get("old_dur")
-        if exis:
-            db[chat_id][0]["dur"] = exis
-            db[chat_id][0]["seconds"] = check[0]["old_second"]
-            db[chat_id][0]["speed_path"] = None
-            db[chat_id][0]["speed"] = 1.0
+        set_played(db[chat_id][0], 0)
+        reset_speed(db[chat_id][0])
         
         if "live_" in queued:
-            n, link = await YouTube.video(videoid, True)
+            n, link = await YouTube.live(videoid, True)
             if n == 0:
                 return await CallbackQuery.message.reply_text(
                     text=_["admin_7"].format(title),
@@ -460,6 +459,7 @@ async def del_back_playlist(client, CallbackQuery, _):
             try:
                 await Nand.skip_stream(chat_id, link, video=status, image=image)
             except:
+                live_urls.forget(videoid)
                 return await CallbackQuery.message.reply_text(_["call_6"])
             
             button = stream_markup(_, chat_id)
@@ -632,11 +632,13 @@ async def markup_timer():
                         buttons = stream_markup_timer(
                             _,
                             chat_id,
-                            seconds_to_min(playing[0]["played"]),
+                            seconds_to_min(get_played(playing[0])),
                             playing[0]["dur"],
                         )
-                        await mystic.edit_reply_markup(
-                            reply_markup=InlineKeyboardMarkup(buttons)
+                        edits.submit(
+                            mystic,
+                            "edit_reply_markup",
+                            reply_markup=InlineKeyboardMarkup(buttons),
                         )
                     except:
                         continue
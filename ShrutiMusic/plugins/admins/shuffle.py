@@ -29,6 +29,7 @@ from ShrutiMusic import app
 from ShrutiMusic.misc import db
 from ShrutiMusic.utils.decorators import AdminRightsCheck
 from ShrutiMusic.utils.inline import close_markup
+from ShrutiMusic.utils.stream.prefetch import prefetch
 from config import BANNED_USERS
 
 
@@ -50,6 +51,7 @@ async def admins(Client, message: Message, _, chat_id):
         return await message.reply_text(_["admin_15"], reply_markup=close_markup(_))
     random.shuffle(check)
     check.insert(0, popped)
+    prefetch(chat_id)
     await message.reply_text(
         _["admin_16"].format(message.from_user.mention), reply_markup=close_markup(_)
     )
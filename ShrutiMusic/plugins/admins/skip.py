@@ -31,6 +31,9 @@ from ShrutiMusic.utils.database import get_loop
 from ShrutiMusic.utils.decorators import AdminRightsCheck
 from ShrutiMusic.utils.inline import close_markup, stream_markup
 from ShrutiMusic.utils.stream.autoclear import auto_clean
+from ShrutiMusic.utils.stream.live import live_urls
+from ShrutiMusic.utils.stream.position import set_played
+from ShrutiMusic.utils.stream.speed import reset_speed
 from ShrutiMusic.utils.thumbnails import gen_thumb
 from config import BANNED_USERS
 
@@ -117,15 +120,10 @@ async def skip(cli, message: Message, _, chat_id):
     streamtype = check[0]["streamtype"]
     videoid = check[0]["vidid"]
     status = True if str(streamtype) == "video" else None
-    db[chat_id][0]["played"] = 0
-    exis = (check[0]).get("old_dur")
-    if exis:
-        db[chat_id][0]["dur"] = exis
-        db[chat_id][0]["seconds"] = check[0]["old_second"]
-        db[chat_id][0]["speed_path"] = None
-        db[chat_id][0]["speed"] = 1.0
+    set_played(db[chat_id][0], 0)
+    reset_speed(db[chat_id][0])
     if "live_" in queued:
-        n, link = await YouTube.video(videoid, True)
+        n, link = await YouTube.live(videoid, True)
         if n == 0:
             return await message.reply_text(_["admin_7"].format(title))
         try:
@@ -135,6 +133,7 @@ async def skip(cli, message: Message, _, chat_id):
         try:
             await Nand.skip_stream(chat_id, link, video=status, image=image)
         except:
+            live_urls.forget(videoid)
             return await message.reply_text(_["call_6"])
         button = stream_markup(_, chat_id)
         img = await gen_thumb(videoid)
@@ -35,9 +35,9 @@ from ShrutiMusic.plugins.sudo.sudoers import sudoers_list
 from ShrutiMusic.utils.database import (
     add_served_chat,
     add_served_user,
-    blacklisted_chats,
     get_lang,
     is_banned_user,
+    is_blacklisted_chat,
     is_on_off,
 )
 from ShrutiMusic.utils import bot_sys_stats
@@ -166,7 +166,7 @@ async def welcome(client, message: Message):
                 if message.chat.type != ChatType.SUPERGROUP:
                     await message.reply_text(_["start_4"])
                     return await app.leave_chat(message.chat.id)
-                if message.chat.id in await blacklisted_chats():
+                if await is_blacklisted_chat(message.chat.id):
                     await message.reply_text(
                         _["start_5"].format(
                             app.mention,
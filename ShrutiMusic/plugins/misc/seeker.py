@@ -1,58 +0,0 @@
-# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
-# Location: Supaul, Bihar
-#
-# All rights reserved.
-#
-# This code is the intellectual property of Nand Yaduwanshi.
-# You are not allowed to copy, modify, redistribute, or use this
-# code for commercial or personal projects without explicit permission.
-#
-# Allowed:
-# - Forking for personal learning
-# - Submitting improvements via pull requests
-#
-# Not Allowed:
-# - Claiming this code as your own
-# - Re-uploading without credit or permission
-# - Selling or using commercially
-#
-# Contact for permissions:
-# Email: badboy809075@gmail.com
-
-
-import asyncio
-
-from ShrutiMusic.misc import db
-from ShrutiMusic.utils.database import get_active_chats, is_music_playing
-
-
-async def timer():
-    while not await asyncio.sleep(1):
-        active_chats = await get_active_chats()
-        for chat_id in active_chats:
-            if not await is_music_playing(chat_id):
-                continue
-            playing = db.get(chat_id)
-            if not playing:
-                continue
-            duration = int(playing[0]["seconds"])
-            if duration == 0:
-                continue
-            if db[chat_id][0]["played"] >= duration:
-                continue
-            db[chat_id][0]["played"] += 1
-
-
-asyncio.create_task(timer())
-
-
-# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
-
-# ===========================================
-# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
-# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
-# 📢 Telegram Channel : https://t.me/ShrutiBots
-# ===========================================
-
-
-# ❤️ Love From ShrutiBots 
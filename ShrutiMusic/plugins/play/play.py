@@ -181,14 +181,8 @@ async def play_commnd(
     elif url:
         if await YouTube.exists(url):
             if "playlist" in url:
-                try:
-                    details = await YouTube.playlist(
-                        url,
-                        config.PLAYLIST_FETCH_LIMIT,
-                        message.from_user.id,
-                    )
-                except:
-                    return await mystic.edit_text(_["play_3"])
+                # ids stream in while the first entries are already queued
+                details = YouTube.playlist_ids(url, config.PLAYLIST_FETCH_LIMIT)
                 streamtype = "playlist"
                 plist_type = "yt"
                 if "&" in url:
@@ -578,15 +572,7 @@ async def play_playlists_command(client, CallbackQuery, _):
     spotify = True
     if ptype == "yt":
         spotify = False
-        try:
-            result = await YouTube.playlist(
-                videoid,
-                config.PLAYLIST_FETCH_LIMIT,
-                CallbackQuery.from_user.id,
-                True,
-            )
-        except:
-            return await mystic.edit_text(_["play_3"])
+        result = YouTube.playlist_ids(videoid, config.PLAYLIST_FETCH_LIMIT, videoid=True)
     if ptype == "spplay":
         try:
             result, spotify_id = await Spotify.playlist(videoid)
@@ -32,9 +32,9 @@ from ShrutiMusic.utils import get_readable_time
 from ShrutiMusic.utils.database import (
     add_banned_user,
     get_banned_count,
-    get_banned_users,
-    get_served_chats,
     is_banned_user,
+    iter_banned_users,
+    iter_served_chats,
     remove_banned_user,
 )
 from ShrutiMusic.utils.decorators.language import language
@@ -60,10 +60,7 @@ async def global_ban(client, message: Message, _):
         return await message.reply_text(_["gban_4"].format(user.mention))
     if user.id not in BANNED_USERS:
         BANNED_USERS.add(user.id)
-    served_chats = []
-    chats = await get_served_chats()
-    for chat in chats:
-        served_chats.append(int(chat["chat_id"]))
+    served_chats = [int(chat_id) async for chat_id in iter_served_chats()]
     time_expected = get_readable_time(len(served_chats))
     mystic = await message.reply_text(_["gban_5"].format(user.mention, time_expected))
     number_of_chats = 0
@@ -102,10 +99,7 @@ async def global_un(client, message: Message, _):
         return await message.reply_text(_["gban_7"].format(user.mention))
     if user.id in BANNED_USERS:
         BANNED_USERS.remove(user.id)
-    served_chats = []
-    chats = await get_served_chats()
-    for chat in chats:
-        served_chats.append(int(chat["chat_id"]))
+    served_chats = [int(chat_id) async for chat_id in iter_served_chats()]
     time_expected = get_readable_time(len(served_chats))
     mystic = await message.reply_text(_["gban_8"].format(user.mention, time_expected))
     number_of_chats = 0
@@ -131,8 +125,7 @@ async def gbanned_list(client, message: Message, _):
     mystic = await message.reply_text(_["gban_11"])
     msg = _["gban_12"]
     count = 0
-    users = await get_banned_users()
-    for user_id in users:
+    async for user_id in iter_banned_users():
         count += 1
         try:
             user = await app.get_users(user_id)
@@ -15,6 +15,8 @@
 
 import asyncio
 import logging
+import re
+import time
 
 from typing import List
 
@@ -26,7 +28,9 @@ from ShrutiMusic import app, LOGGER
 import config
 from ShrutiMusic.misc import SUDOERS
 from ShrutiMusic.core.mongo import mongodb
+from ShrutiMusic.utils.database.cache import MISSING, settings
 from ShrutiMusic.utils.decorators import AdminActual
+from ShrutiMusic.utils.stream.singleflight import flights
 
 # Logger setup (fixes AttributeError issue)
 LOGGER = logging.getLogger(__name__)
@@ -34,47 +38,92 @@ LOGGER = logging.getLogger(__name__)
 COL = mongodb.antigcst  # per-chat collection
 CFG = mongodb.antigcst_config  # global config collection
 
+ADMIN_TTL = 600  # seconds an admin list is trusted without a member update
+ADMIN_STATUS = (enums.ChatMemberStatus.ADMINISTRATOR, enums.ChatMemberStatus.OWNER)
+
+# chat_id -> (expires_at, set of admin user ids)
+_admins = {}
+
 
 def _chat_doc_key(chat_id: int):
     return {"chat_id": chat_id}
 
 
-async def _get_doc(chat_id: int) -> dict:
-    doc = await COL.find_one(_chat_doc_key(chat_id))
-    if not doc:
-        doc = {
-            "chat_id": chat_id,
-            "protect": False,
-            "delete_all": False,  # strict mode: delete any message (except exempt)
-            "approved_users": [],
-            "silent_users": [],
-            "delete_words": [],
-        }
-        await COL.insert_one(doc)
-    return doc
+def _compile_words(words: List[str]):
+    """
+    Build one alternation for the whole text blacklist so a message is scanned
+    once, no matter how many phrases the chat has. Longer phrases go first so
+    overlapping entries still match.
+    """
+    words = sorted({w.lower() for w in words if w}, key=len, reverse=True)
+    if not words:
+        return None
+    return re.compile("|".join(re.escape(w) for w in words))
+
+
+def _build_policy(doc: dict) -> dict:
+    doc = doc or {}
+    approved = list(doc.get("approved_users", []))
+    silent = list(doc.get("silent_users", []))
+    words = list(doc.get("delete_words", []))
+    return {
+        "protect": bool(doc.get("protect")),
+        "delete_all": bool(doc.get("delete_all")),  # strict mode: delete any message (except exempt)
+        "approved_users": approved,
+        "silent_users": silent,
+        "delete_words": words,
+        "approved": set(approved),
+        "silent": set(silent),
+        "matcher": _compile_words(words),
+    }
+
+
+async def _load_policy(chat_id: int) -> dict:
+    policy = _build_policy(await COL.find_one(_chat_doc_key(chat_id)))
+    settings.set("antigcst", chat_id, policy)
+    return policy
+
+
+async def _get_policy(chat_id: int) -> dict:
+    """Per-chat policy, read from the settings cache and refilled on a miss."""
+    policy = settings.get("antigcst", chat_id)
+    if policy is MISSING:
+        policy = await flights.run(("antigcst", chat_id), _load_policy, chat_id)
+    return policy
+
+
+async def _forget(chat_id: int):
+    settings.drop("antigcst", chat_id)
+    await settings.changed()
 
 
 async def _set_protect(chat_id: int, value: bool):
     await COL.update_one(_chat_doc_key(chat_id), {"$set": {"protect": value}}, upsert=True)
+    await _forget(chat_id)
 
 
 async def _set_delete_all(chat_id: int, value: bool):
     await COL.update_one(_chat_doc_key(chat_id), {"$set": {"delete_all": value}}, upsert=True)
+    await _forget(chat_id)
+
+
+async def _set_list(chat_id: int, field: str, value: List):
+    await COL.update_one(_chat_doc_key(chat_id), {"$set": {field: value}}, upsert=True)
+    await _forget(chat_id)
 
 
 async def _add_to_list(chat_id: int, field: str, value):
     await COL.update_one(_chat_doc_key(chat_id), {"$addToSet": {field: value}}, upsert=True)
+    await _forget(chat_id)
 
 
 async def _remove_from_list(chat_id: int, field: str, value):
     await COL.update_one(_chat_doc_key(chat_id), {"$pull": {field: value}}, upsert=True)
+    await _forget(chat_id)
 
 
 async def _get_list(chat_id: int, field: str) -> List:
-    doc = await COL.find_one(_chat_doc_key(chat_id))
-    if not doc:
-        return []
-    return doc.get(field, [])
+    return (await _get_policy(chat_id))[field]
 
 
 # --- Minimal safe delete helper (new) ----------------
@@ -168,15 +217,15 @@ async def antigcst_toggle(client, message: Message, _):
                 )
 
     if mode in ("on", "true", "1"):
-        doc = await _get_doc(chat_id)
-        if doc.get("protect"):
+        policy = await _get_policy(chat_id)
+        if policy["protect"]:
             return await message.reply_text("<blockquote><b>Protect sudah diaktifkan</b></blockquote>")
         await _set_protect(chat_id, True)
         await _notify_chat_toggle(chat_id, f"<blockquote><b>🔒 Anti-Gcast PROTECT diaktifkan oleh {user_mention}</b></blockquote>")
         return await message.reply_text("<blockquote><b>Berhasil mengaktifkan protect</b></blockquote>")
     elif mode in ("off", "false", "0"):
-        doc = await _get_doc(chat_id)
-        if not doc.get("protect"):
+        policy = await _get_policy(chat_id)
+        if not policy["protect"]:
             return await message.reply_text("<blockquote><b>Protect belum diaktifkan</b></blockquote>")
         await _set_protect(chat_id, False)
         await _notify_chat_toggle(chat_id, f"<blockquote><b>🔓 Anti-Gcast PROTECT dinonaktifkan oleh {user_mention}</b></blockquote>")
@@ -352,7 +401,7 @@ async def list_approved(_, message: Message, __):
 @app.on_message(filters.command(["clearwhite", "clearfree", "clearapproved"]) & filters.group)
 @AdminActual
 async def clear_approved(_, message: Message, __):
-    await COL.update_one(_chat_doc_key(message.chat.id), {"$set": {"approved_users": []}}, upsert=True)
+    await _set_list(message.chat.id, "approved_users", [])
     return await message.reply_text("<blockquote><b>Berhasil menghapus semua pengguna approved</b></blockquote>")
 
 
@@ -427,7 +476,7 @@ async def list_black(_, message: Message, __):
 @app.on_message(filters.command(["clearblack"]) & filters.group)
 @AdminActual
 async def clear_black(_, message: Message, __):
-    await COL.update_one(_chat_doc_key(message.chat.id), {"$set": {"silent_users": []}}, upsert=True)
+    await _set_list(message.chat.id, "silent_users", [])
     return await message.reply_text("<blockquote><b>Berhasil menghapus list black pengguna</b></blockquote>")
 
 
@@ -485,19 +534,56 @@ async def list_word_blacklist(_, message: Message, __):
 async def is_chat_admin(client, chat_id: int, user_id: int) -> bool:
     try:
         member = await client.get_chat_member(chat_id, user_id)
-        return member.status in (enums.ChatMemberStatus.ADMINISTRATOR, enums.ChatMemberStatus.OWNER)
+        return member.status in ADMIN_STATUS
     except Exception:
         # if cannot fetch, default to False (not admin)
         return False
 
 
+async def _load_admins(client, chat_id: int) -> set:
+    admins = set()
+    async for member in client.get_chat_members(
+        chat_id, filter=enums.ChatMembersFilter.ADMINISTRATORS
+    ):
+        if member.user:
+            admins.add(member.user.id)
+    _admins[chat_id] = (time.monotonic() + ADMIN_TTL, admins)
+    return admins
+
+
+async def _is_admin(client, chat_id: int, user_id: int) -> bool:
+    """
+    Answer from the cached admin set of the chat. The set is fetched once per
+    ADMIN_TTL (concurrent misses share one request) and dropped as soon as a
+    member update touches an admin.
+    """
+    cached = _admins.get(chat_id)
+    if cached and cached[0] > time.monotonic():
+        return user_id in cached[1]
+    try:
+        admins = await flights.run(("admins", chat_id), _load_admins, client, chat_id)
+    except Exception:
+        return await is_chat_admin(client, chat_id, user_id)
+    return user_id in admins
+
+
+@app.on_chat_member_updated(filters.group, group=8)
+async def antigcst_admins_changed(client, update):
+    if update.chat.id not in _admins:
+        return
+    old = update.old_chat_member
+    new = update.new_chat_member
+    if (old and old.status in ADMIN_STATUS) or (new and new.status in ADMIN_STATUS):
+        _admins.pop(update.chat.id, None)
+
+
 # Core protection: delete messages from blacklisted users or containing blacklisted words,
 # and if delete_all is enabled, delete any non-exempt message immediately.
 @app.on_message(filters.group & ~filters.bot, group=2)
 async def antigcst_handler(client, message: Message):
     try:
-        doc = await COL.find_one(_chat_doc_key(message.chat.id))
-        if not doc or not doc.get("protect"):
+        policy = await _get_policy(message.chat.id)
+        if not policy["protect"]:
             return
         if message.sender_chat:
             return
@@ -505,12 +591,12 @@ async def antigcst_handler(client, message: Message):
         if not uid:
             return
 
-        if uid in doc.get("approved_users", []):
-            return
-        if await is_chat_admin(client, message.chat.id, uid):
+        if uid in policy["approved"]:
             return
         if uid in SUDOERS:
             return
+        if await _is_admin(client, message.chat.id, uid):
+            return
 
         warn_text = f"<blockquote><b>⚠️ WARN , {message.from_user.mention} Pesan anda telah dihapus karena ANDA JELEK</b></blockquote>"
 
@@ -523,7 +609,7 @@ async def antigcst_handler(client, message: Message):
             await asyncio.sleep(5)
             await _safe_delete(client, message.chat.id, sent.id, silent=True)
 
-        if doc.get("delete_all", False):
+        if policy["delete_all"]:
             try:
                 await _safe_delete(client, message.chat.id, message.id, silent=True)
                 await send_and_delete_warning()
@@ -531,7 +617,7 @@ async def antigcst_handler(client, message: Message):
                 LOGGER.warning("Failed to delete message in strict mode in chat %s: %s", message.chat.id, e)
             return
 
-        if uid in doc.get("silent_users", []):
+        if uid in policy["silent"]:
             try:
                 await _safe_delete(client, message.chat.id, message.id, silent=True)
                 await send_and_delete_warning()
@@ -540,14 +626,14 @@ async def antigcst_handler(client, message: Message):
             return
 
         text = message.text or message.caption or ""
-        for word in doc.get("delete_words", []):
-            if word and word.lower() in text.lower():
-                try:
-                    await _safe_delete(client, message.chat.id, message.id, silent=True)
-                    await send_and_delete_warning()
-                except Exception as e:
-                    LOGGER.warning("Failed to delete message containing blacklisted word in chat %s: %s", message.chat.id, e)
-                return
+        matcher = policy["matcher"]
+        if matcher and text and matcher.search(text.lower()):
+            try:
+                await _safe_delete(client, message.chat.id, message.id, silent=True)
+                await send_and_delete_warning()
+            except Exception as e:
+                LOGGER.warning("Failed to delete message containing blacklisted word in chat %s: %s", message.chat.id, e)
+            return
     except Exception as e:
         LOGGER.error("Error in antigcst_handler: %s", e)
 
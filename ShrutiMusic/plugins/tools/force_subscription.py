@@ -20,21 +20,121 @@
 # Email: badboy809075@gmail.com
 
 
+import time
+from collections import OrderedDict
+
 from pyrogram import Client, filters
 from pyrogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery, ChatPermissions
-from pymongo import MongoClient
 from ShrutiMusic import app
 import asyncio
+from ShrutiMusic.core.mongo import _mongo_async_
 from ShrutiMusic.misc import SUDOERS
-from config import MONGO_DB_URI
+from ShrutiMusic.utils.database.cache import MISSING, settings
 from pyrogram.enums import ChatMembersFilter
 from pyrogram.errors import (
     ChatAdminRequired,
     UserNotParticipant,
 )
 
-fsubdb = MongoClient(MONGO_DB_URI)
-forcesub_collection = fsubdb.status_db.status
+forcesub_collection = _mongo_async_.status_db.status
+
+JOINED_TTL = 600  # seconds a "joined" verdict is trusted
+NOT_JOINED_TTL = 60  # seconds a "not joined" verdict is trusted
+VERDICT_LIMIT = 50000
+BATCH_WINDOW = 0.2  # seconds to wait for more lookups before verifying
+BATCH_SIZE = 20
+
+# (channel_id, user_id) -> (expires_at, joined)
+verdicts = OrderedDict()
+# (channel_id, user_id) -> future shared by everyone waiting on that lookup
+pending = {}
+batch = asyncio.Queue()
+worker = None
+
+
+async def get_forcesub(chat_id: int):
+    data = settings.get("fsub", chat_id)
+    if data is MISSING:
+        data = await forcesub_collection.find_one({"chat_id": chat_id})
+        settings.set("fsub", chat_id, data)
+    return data
+
+
+async def set_forcesub_channel(chat_id: int, channel_id: int, channel_username):
+    data = {"chat_id": chat_id, "channel_id": channel_id, "channel_username": channel_username}
+    settings.set("fsub", chat_id, data)
+    await forcesub_collection.update_one(
+        {"chat_id": chat_id},
+        {"$set": {"channel_id": channel_id, "channel_username": channel_username}},
+        upsert=True
+    )
+    await settings.changed()
+
+
+async def remove_forcesub(chat_id: int):
+    settings.set("fsub", chat_id, None)
+    await forcesub_collection.delete_one({"chat_id": chat_id})
+    await settings.changed()
+
+
+def remember(channel_id: int, user_id: int, joined: bool):
+    ttl = JOINED_TTL if joined else NOT_JOINED_TTL
+    verdicts[(channel_id, user_id)] = (time.monotonic() + ttl, joined)
+    verdicts.move_to_end((channel_id, user_id))
+    if len(verdicts) > VERDICT_LIMIT:
+        verdicts.popitem(last=False)
+
+
+async def lookup(channel_id: int, user_id: int) -> bool:
+    try:
+        await app.get_chat_member(channel_id, user_id)
+        joined = True
+    except UserNotParticipant:
+        joined = False
+    remember(channel_id, user_id, joined)
+    return joined
+
+
+async def verify_loop():
+    while True:
+        keys = [await batch.get()]
+        await asyncio.sleep(BATCH_WINDOW)
+        while not batch.empty() and len(keys) < BATCH_SIZE:
+            keys.append(batch.get_nowait())
+        results = await asyncio.gather(
+            *(lookup(*key) for key in keys), return_exceptions=True
+        )
+        for key, result in zip(keys, results):
+            future = pending.pop(key, None)
+            if future is None or future.done():
+                continue
+            if isinstance(result, asyncio.CancelledError):
+                future.cancel()
+            elif isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+async def is_joined(channel_id: int, user_id: int) -> bool:
+    """
+    Channel membership from the verdict cache. Misses are queued and
+    verified together in small batches; concurrent misses for the same
+    user share one lookup.
+    """
+    global worker
+    key = (channel_id, user_id)
+    cached = verdicts.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    future = pending.get(key)
+    if future is None:
+        future = asyncio.get_running_loop().create_future()
+        pending[key] = future
+        batch.put_nowait(key)
+        if worker is None or worker.done():
+            worker = asyncio.create_task(verify_loop())
+    return await asyncio.shield(future)
 
 @app.on_message(filters.command(["fsub", "forcesub"]) & filters.group)
 async def set_forcesub(client: Client, message: Message):
@@ -47,7 +147,7 @@ async def set_forcesub(client: Client, message: Message):
         return await message.reply_text("**ᴏɴʟʏ ɢʀᴏᴜᴘ ᴀᴅᴍɪɴs ᴏʀ sᴜᴅᴏᴇʀs ᴄᴀɴ ᴜsᴇ ᴛʜɪs ᴄᴏᴍᴍᴀɴᴅ.**")
 
     if len(message.command) == 2 and message.command[1].lower() in ["off", "disable"]:
-        forcesub_collection.delete_one({"chat_id": chat_id})
+        await remove_forcesub(chat_id)
         return await message.reply_text("**ғᴏʀᴄᴇ sᴜʙsᴄʀɪᴘᴛɪᴏɴ ʜᴀs ʙᴇᴇɴ ᴅɪsᴀʙʟᴇᴅ ғᴏʀ ᴛʜɪs ɢʀᴏᴜᴘ.**")
 
     if len(message.command) != 2:
@@ -60,11 +160,7 @@ async def set_forcesub(client: Client, message: Message):
         channel_id = channel_info.id
         channel_username = f"{channel_info.username}" if channel_info.username else None
 
-        forcesub_collection.update_one(
-            {"chat_id": chat_id},
-            {"$set": {"channel_id": channel_id, "channel_username": channel_username}},
-            upsert=True
-        )
+        await set_forcesub_channel(chat_id, channel_id, channel_username)
 
         await message.reply_text(f"**🎉 Force subscription set to channel:** [{channel_info.title}](https://t.me/{channel_username})")
 
@@ -74,8 +170,15 @@ async def set_forcesub(client: Client, message: Message):
 @app.on_chat_member_updated()
 async def on_user_join(client: Client, chat_member_updated):
     chat_id = chat_member_updated.chat.id
+    member = chat_member_updated.new_chat_member or chat_member_updated.old_chat_member
+    if member and member.user:
+        # membership of this chat changed, so any cached verdict for it is stale
+        verdicts.pop((chat_id, member.user.id), None)
+
+    if not chat_member_updated.from_user:
+        return
     user_id = chat_member_updated.from_user.id
-    forcesub_data = forcesub_collection.find_one({"chat_id": chat_id})
+    forcesub_data = await get_forcesub(chat_id)
 
     if not forcesub_data:
         return  # No force subscription set for this group
@@ -90,11 +193,9 @@ async def on_user_join(client: Client, chat_member_updated):
     # Check if the user joined the group
     if new_chat_member.status == "member":
         try:
-            # Check if the user is a member of the channel
-            user_member = await app.get_chat_member(channel_id, user_id)
             # If the user is a member of the channel, do nothing
-            return
-        except UserNotParticipant:
+            if await is_joined(channel_id, user_id):
+                return
             # User is not a member of the channel, mute them
             await client.restrict_chat_member(
                 chat_id,
@@ -146,7 +247,7 @@ async def check_forcesub(client: Client, message: Message):
         return  # Exit if the message does not come from a user
 
     user_id = message.from_user.id
-    forcesub_data = forcesub_collection.find_one({"chat_id": chat_id})
+    forcesub_data = await get_forcesub(chat_id)
     if not forcesub_data:
         return
 
@@ -154,10 +255,8 @@ async def check_forcesub(client: Client, message: Message):
     channel_username = forcesub_data["channel_username"]
 
     try:
-        user_member = await app.get_chat_member(channel_id, user_id)
-        if user_member:
+        if await is_joined(channel_id, user_id):
             return
-    except UserNotParticipant:
         if channel_username:
             channel_url = f"https://t.me/{channel_username}"
         else:
@@ -170,7 +269,7 @@ async def check_forcesub(client: Client, message: Message):
         )
         await asyncio.sleep(1)
     except ChatAdminRequired:
-        forcesub_collection.delete_one({"chat_id": chat_id})
+        await remove_forcesub(chat_id)
         return await message.reply_text("**🚫 I'ᴍ ɴᴏ ʟᴏɴɢᴇʀ ᴀɴ ᴀᴅᴍɪɴ ɪɴ ᴛʜᴇ ғᴏʀᴄᴇᴅ sᴜʙsᴄʀɪᴘᴛɪᴏɴ ᴄʜᴀɴɴᴇʟ. ғᴏʀᴄᴇ sᴜʙsᴄʀɪᴘᴛɪᴏɴ ʜᴀs ʙᴇᴇɴ ᴅɪsᴀʙʟᴇᴅ.**")
 
 @app.on_message(filters.group, group=30)
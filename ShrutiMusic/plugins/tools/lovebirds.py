@@ -2,8 +2,12 @@
 # Features: Enhanced Virtual Gift System + Love Story Generator with MongoDB
 # Author: Nand Yaduwanshi 
 
+import asyncio
 import random
+import time
 from datetime import datetime
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
 from pyrogram import filters
 from pyrogram.types import Message
 
@@ -33,36 +37,133 @@ GIFTS = {
     "🍓": {"name": "Strawberry", "cost": 12, "emoji": "🍓"}
 }
 
+FLUSH_INTERVAL = 10  # seconds between ledger flushes
+INDEX_REFRESH = 300  # seconds between reloads of the pending gift index
+
+
+def new_user_doc(user_id):
+    return {
+        "user_id": user_id,
+        "coins": 50,  # Starting bonus
+        "total_gifts_received": 0,
+        "total_gifts_sent": 0,
+        "created_at": datetime.utcnow().isoformat()
+    }
+
+
+class CoinLedger:
+    """
+    Write-behind ledger for chat rewards.
+
+    Coin increments are merged per user in memory and written with one
+    bulk_write every FLUSH_INTERVAL seconds. Users that have unclaimed gifts
+    are tracked by receiver name, so ordinary messages never query the gifts
+    collection.
+    """
+
+    def __init__(self):
+        self.known = set()  # user ids that already have a document
+        self.pending = {}  # user_id -> {field: increment}
+        self.gift_names = set()  # receiver names with unclaimed gifts
+        self.indexed = 0
+        self.lock = asyncio.Lock()
+        self.task = None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._loop())
+
+    def touch(self, user_id):
+        """Make sure the user gets a document on the next flush."""
+        if user_id not in self.known:
+            self.pending.setdefault(user_id, {})
+
+    def add(self, user_id, **inc):
+        entry = self.pending.setdefault(user_id, {})
+        for field, amount in inc.items():
+            entry[field] = entry.get(field, 0) + amount
+
+    async def flush(self):
+        async with self.lock:
+            if not self.pending:
+                return
+            pending, self.pending = self.pending, {}
+            ops, owners = [], []
+            for user_id, inc in pending.items():
+                if user_id not in self.known:
+                    ops.append(UpdateOne(
+                        {"user_id": user_id},
+                        {"$setOnInsert": new_user_doc(user_id)},
+                        upsert=True,
+                    ))
+                    owners.append((user_id, {}))
+                if inc:
+                    ops.append(UpdateOne({"user_id": user_id}, {"$inc": inc}, upsert=True))
+                    owners.append((user_id, inc))
+            try:
+                await users_collection.bulk_write(ops, ordered=True)
+            except PyMongoError as e:
+                # ordered writes stop at the first error, everything before it
+                # is applied; the rest goes out again with the next flush
+                done = 0
+                if isinstance(e, BulkWriteError) and e.details.get("writeErrors"):
+                    done = e.details["writeErrors"][0]["index"]
+                for user_id, inc in owners[done:]:
+                    self.touch(user_id)
+                    self.add(user_id, **inc)
+                LOGGER(__name__).warning(f"lovebirds ledger flush failed: {e}")
+                return
+            self.known.update(pending)
+
+    async def refresh_index(self):
+        names = await gifts_collection.distinct("receiver_name", {"claimed": False})
+        self.gift_names = set(names)
+        self.indexed = time.monotonic()
+
+    def has_gifts(self, username) -> bool:
+        return bool(username) and username in self.gift_names
+
+    async def _loop(self):
+        while True:
+            try:
+                if time.monotonic() - self.indexed > INDEX_REFRESH:
+                    await self.refresh_index()
+                await self.flush()
+            except Exception as e:
+                LOGGER(__name__).warning(f"lovebirds ledger error: {e}")
+            await asyncio.sleep(FLUSH_INTERVAL)
+
+    async def close(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        await self.flush()
+
+
+ledger = CoinLedger()
+
 
 async def get_user_data(user_id):
     """Get user data from MongoDB"""
     if user_id is None:
         return None
+    await ledger.flush()
     user_data = await users_collection.find_one({"user_id": user_id})
     if not user_data:
         # Create new user
-        new_user = {
-            "user_id": user_id,
-            "coins": 50,  # Starting bonus
-            "total_gifts_received": 0,
-            "total_gifts_sent": 0,
-            "created_at": datetime.utcnow().isoformat()
-        }
+        new_user = new_user_doc(user_id)
         await users_collection.insert_one(new_user)
-        return new_user
+        user_data = new_user
+    ledger.known.add(user_id)
     return user_data
 
 
 async def update_user_coins(user_id, amount):
-    """Add coins to user"""
+    """Add coins to user (written by the ledger on its next flush)"""
     if user_id is None:
         # nothing to do
         return
-    await users_collection.update_one(
-        {"user_id": user_id},
-        {"$inc": {"coins": amount}},
-        upsert=True
-    )
+    ledger.add(user_id, coins=amount)
 
 
 async def get_user_gifts(user_id, gift_type="received"):
@@ -190,6 +291,7 @@ async def send_gift(_, message: Message):
         }
 
         await gifts_collection.insert_one(gift_record)
+        ledger.gift_names.add(target)
 
         # Update sender data
         updated_sender = await get_user_data(sender_id)
@@ -219,7 +321,7 @@ async def send_gift(_, message: Message):
 
 async def claim_pending_gifts(user_id, username):
     """Claim gifts that were sent to this user"""
-    if user_id is None or not username:
+    if user_id is None or not ledger.has_gifts(username):
         return 0, 0
 
     # Find gifts sent to this username that aren't claimed yet
@@ -245,14 +347,12 @@ async def claim_pending_gifts(user_id, username):
             )
             total_bonus += 5  # 5 bonus coins per gift
 
-        await users_collection.update_one(
-            {"user_id": user_id},
-            {"$inc": {"coins": total_bonus, "total_gifts_received": gift_count}},
-            upsert=True
-        )
+        ledger.gift_names.discard(username)
+        ledger.add(user_id, coins=total_bonus, total_gifts_received=gift_count)
 
         return gift_count, total_bonus
 
+    ledger.gift_names.discard(username)
     return 0, 0
 
 
@@ -353,6 +453,7 @@ async def my_gifts(_, message: Message):
 async def leaderboard(_, message: Message):
     try:
         # Top users by coins
+        await ledger.flush()
         top_users = await users_collection.find().sort("coins", -1).limit(10).to_list(length=10)
 
         if not top_users:
@@ -381,8 +482,7 @@ async def give_coins_and_claim_gifts(_, message: Message):
         # do not process channel posts/anonymous
         return
 
-    await get_user_data(uid)
-
+    ledger.touch(uid)
     gift_count, bonus_coins = await claim_pending_gifts(uid, username)
 
     if gift_count > 0:
@@ -399,3 +499,6 @@ Use /mygifts to see your received gifts! 💝
     # Random 20% chance for coin reward
     if random.randint(1, 100) <= 20:
         await update_user_coins(uid, 1)
+
+
+ledger.start()
@@ -24,16 +24,17 @@ import asyncio
 import os
 
 from pyrogram import filters
-from pyrogram.errors import FloodWait
 from pyrogram.types import CallbackQuery, InputMediaPhoto, Message
 
 import config
 from ShrutiMusic import app
+from ShrutiMusic.core.edits import edits
 from ShrutiMusic.misc import db
 from ShrutiMusic.utils import NandBin, get_channeplayCB, seconds_to_min
 from ShrutiMusic.utils.database import get_cmode, is_active_chat, is_music_playing
 from ShrutiMusic.utils.decorators.language import language, languageCB
 from ShrutiMusic.utils.inline import queue_back_markup, queue_markup
+from ShrutiMusic.utils.stream.position import get_played
 from config import BANNED_USERS
 
 basic = {}
@@ -114,7 +115,7 @@ async def get_queue(client, message: Message, _):
             DUR,
             "c" if cplay else "g",
             videoid,
-            seconds_to_min(got[0]["played"]),
+            seconds_to_min(get_played(got[0])),
             got[0]["dur"],
         )
     )
@@ -127,18 +128,15 @@ async def get_queue(client, message: Message, _):
                 if await is_active_chat(chat_id):
                     if basic[videoid]:
                         if await is_music_playing(chat_id):
-                            try:
-                                buttons = queue_markup(
-                                    _,
-                                    DUR,
-                                    "c" if cplay else "g",
-                                    videoid,
-                                    seconds_to_min(db[chat_id][0]["played"]),
-                                    db[chat_id][0]["dur"],
-                                )
-                                await mystic.edit_reply_markup(reply_markup=buttons)
-                            except FloodWait:
-                                pass
+                            buttons = queue_markup(
+                                _,
+                                DUR,
+                                "c" if cplay else "g",
+                                videoid,
+                                seconds_to_min(get_played(db[chat_id][0])),
+                                db[chat_id][0]["dur"],
+                            )
+                            edits.submit(mystic, "edit_reply_markup", reply_markup=buttons)
                         else:
                             pass
                     else:
@@ -254,7 +252,7 @@ async def queue_back(client, CallbackQuery: CallbackQuery, _):
             DUR,
             cplay,
             videoid,
-            seconds_to_min(got[0]["played"]),
+            seconds_to_min(get_played(got[0])),
             got[0]["dur"],
         )
     )
@@ -269,18 +267,15 @@ async def queue_back(client, CallbackQuery: CallbackQuery, _):
                 if await is_active_chat(chat_id):
                     if basic[videoid]:
                         if await is_music_playing(chat_id):
-                            try:
-                                buttons = queue_markup(
-                                    _,
-                                    DUR,
-                                    cplay,
-                                    videoid,
-                                    seconds_to_min(db[chat_id][0]["played"]),
-                                    db[chat_id][0]["dur"],
-                                )
-                                await mystic.edit_reply_markup(reply_markup=buttons)
-                            except FloodWait:
-                                pass
+                            buttons = queue_markup(
+                                _,
+                                DUR,
+                                cplay,
+                                videoid,
+                                seconds_to_min(get_played(db[chat_id][0])),
+                                db[chat_id][0]["dur"],
+                            )
+                            edits.submit(mystic, "edit_reply_markup", reply_markup=buttons)
                         else:
                             pass
                     else:
@@ -26,20 +26,57 @@ from sys import version as pyver
 import psutil
 from pyrogram import __version__ as pyrover
 from pyrogram import filters
-from pyrogram.errors import MessageIdInvalid
+from pyrogram.errors import MediaCaptionTooLong, MessageIdInvalid
 from pyrogram.types import InputMediaPhoto, Message
 from pytgcalls.__version__ import __version__ as pytgver
 
 import config
 from ShrutiMusic import app
+from ShrutiMusic.core.call import Nand
 from ShrutiMusic.core.userbot import assistants
 from ShrutiMusic.misc import SUDOERS, mongodb
 from ShrutiMusic.plugins import ALL_MODULES
-from ShrutiMusic.utils.database import get_served_chats, get_served_users, get_sudoers,is_autoend,is_autoleave
+from ShrutiMusic.utils.database import count_served_chats, count_served_users, get_sudoers,is_autoend,is_autoleave
 from ShrutiMusic.utils.decorators.language import language, languageCB
 from ShrutiMusic.utils.inline.stats import back_stats_buttons, stats_buttons
+from ShrutiMusic.utils.stream.cookies import cookie_pool
 from config import BANNED_USERS
 
+CAPTION_LIMIT = 1024
+
+
+def assistant_load() -> str:
+    lines = ["\n\n<b>𝖠𝗌𝗌𝗂𝗌𝗍𝖺𝗇𝗍 𝖫𝗈𝖺𝖽 :</b>"]
+    for row in Nand.load_report(assistants):
+        lines.append(
+            f"{'🟢' if row['healthy'] else '🔴'} <code>{row['assistant']}</code> : "
+            f"{row['calls']} calls, {row['video']} video, "
+            f"load {row['load']:g}, {row['errors']} errors"
+        )
+    return "\n".join(lines)
+
+
+def caption_length(text: str) -> int:
+    # Telegram counts UTF-16 code units, tags are counted too to stay safe
+    return len(text.encode("utf-16-le")) // 2
+
+
+def cookie_health(room: int) -> str:
+    """Cookie pool summary plus the benched files, as far as `room` allows."""
+    rows = cookie_pool.health()
+    if not rows:
+        return ""
+    benched = [row for row in rows if row["cooldown"]]
+    text = f"\n\n<b>𝖢𝗈𝗈𝗄𝗂𝖾𝗌 :</b> {len(rows) - len(benched)} ready, {len(benched)} benched"
+    if caption_length(text) > room:
+        return ""
+    for row in sorted(benched, key=lambda row: -row["cooldown"]):
+        line = f"\n⏳ <code>{row['name'][:24]}</code> : {row['cooldown']}s, {row['fail']} failed"
+        if caption_length(text + line) > room:
+            break
+        text += line
+    return text
+
 
 @app.on_message(filters.command(["stats", "gstats"]) & filters.group & ~BANNED_USERS)
 @language
@@ -72,8 +109,8 @@ async def overall_stats(client, CallbackQuery, _):
     except:
         pass
     await CallbackQuery.edit_message_text(_["gstats_1"].format(app.mention))
-    served_chats = len(await get_served_chats())
-    served_users = len(await get_served_users())
+    served_chats = await count_served_chats()
+    served_users = await count_served_users()
     text = _["gstats_3"].format(
         app.mention,
         len(assistants),
@@ -86,9 +123,17 @@ async def overall_stats(client, CallbackQuery, _):
         config.DURATION_LIMIT_MIN,
         await is_autoleave()  
     )
+    base = text
+    text += assistant_load()
+    if caption_length(text) > CAPTION_LIMIT:
+        text = base
+    text += cookie_health(CAPTION_LIMIT - caption_length(text))
     med = InputMediaPhoto(media=config.STATS_IMG_URL, caption=text)
     try:
         await CallbackQuery.edit_message_media(media=med, reply_markup=upl)
+    except MediaCaptionTooLong:
+        med = InputMediaPhoto(media=config.STATS_IMG_URL, caption=base)
+        await CallbackQuery.edit_message_media(media=med, reply_markup=upl)
     except MessageIdInvalid:
         await CallbackQuery.message.reply_photo(
             photo=config.STATS_IMG_URL, caption=text, reply_markup=upl
@@ -124,8 +169,8 @@ async def bot_stats(client, CallbackQuery, _):
     call = await mongodb.command("dbstats")
     datasize = call["dataSize"] / 1024
     storage = call["storageSize"] / 1024
-    served_chats = len(await get_served_chats())
-    served_users = len(await get_served_users())
+    served_chats = await count_served_chats()
+    served_users = await count_served_users()
     text = _["gstats_5"].format(
         app.mention,
         len(ALL_MODULES),
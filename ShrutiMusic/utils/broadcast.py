@@ -0,0 +1,288 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+
+import asyncio
+import time
+
+from bson import ObjectId
+from pyrogram.errors import FloodWait, InputUserDeactivated, UserIsBlocked
+
+import config
+from ShrutiMusic import app
+from ShrutiMusic.core.edits import BACKGROUND, TokenBucket, edits
+from ShrutiMusic.core.mongo import mongodb
+from ShrutiMusic.logging import LOGGER
+from ShrutiMusic.utils.database.cache import settings
+from ShrutiMusic.utils.database.mongodatabase import chatsdb, usersdb
+from ShrutiMusic.utils.formatters import seconds_to_min
+from strings import get_string
+
+jobsdb = mongodb.broadcast_jobs
+
+# target -> (collection, id field, query)
+TARGETS = {
+    "chats": (chatsdb, "chat_id", {"chat_id": {"$lt": 0}}),
+    "users": (usersdb, "user_id", {"user_id": {"$gt": 0}}),
+}
+COUNTERS = ("cursor", "sent", "failed", "pruned", "pinned")
+# users that will never receive anything again
+GONE = (UserIsBlocked, InputUserDeactivated)
+# skip a target instead of retrying when told to wait longer than this
+FLOOD_SKIP = 200
+PROGRESS_EVERY = 10
+
+
+class Broadcaster:
+    """
+    Background broadcast jobs.
+
+    Targets are read from mongo in _id order and sent to by up to
+    BROADCAST_WORKERS tasks, all paced by one token bucket that halves its
+    rate on FloodWait and creeps back up while sends go through. The job's
+    cursor and counters are saved after every batch, so a restarted bot
+    picks running jobs up where they stopped. Users who blocked the bot or
+    deleted their account are dropped from the served users.
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self.running = {}
+        self.bucket = TokenBucket(config.BROADCAST_RATE, config.BROADCAST_WORKERS)
+        self.paused = 0.0
+
+    async def start(self, target, report, lang, from_chat=None, message_id=None, text=None, forward=False, pin=None) -> dict:
+        job = {
+            "_id": str(ObjectId()),
+            "target": target,
+            "from_chat": from_chat,
+            "message_id": message_id,
+            "text": text,
+            "forward": forward,
+            "pin": pin,
+            "lang": lang,
+            "report_chat": report.chat.id,
+            "report_id": report.id,
+            "cursor": None,
+            "sent": 0,
+            "failed": 0,
+            "pruned": 0,
+            "pinned": 0,
+            "status": "running",
+            "created": time.time(),
+        }
+        await jobsdb.insert_one(job)
+        self.spawn(job, report)
+        return job
+
+    def spawn(self, job, report=None):
+        self.running[job["_id"]] = job
+        self.jobs[job["_id"]] = asyncio.create_task(self.run(job, report))
+
+    async def resume(self):
+        async for job in jobsdb.find({"status": "running"}):
+            if job["_id"] not in self.jobs:
+                LOGGER(__name__).info(f"Resuming broadcast {job['_id']} to {job['target']}")
+                self.spawn(job)
+
+    async def cancel(self) -> int:
+        cancelled = 0
+        for job_id, task in list(self.jobs.items()):
+            task.cancel()
+            cancelled += 1
+            await jobsdb.update_one({"_id": job_id}, {"$set": {"status": "cancelled"}})
+        return cancelled
+
+    async def pace(self):
+        while True:
+            now = time.monotonic()
+            delay = max(self.paused - now, self.bucket.wait(now))
+            if delay <= 0:
+                self.bucket.take()
+                return
+            await asyncio.sleep(delay)
+
+    async def send(self, job, chat_id, markup) -> bool:
+        """Deliver to one target, False when the target is gone for good."""
+        while True:
+            await self.pace()
+            try:
+                if job["forward"]:
+                    m = await app.forward_messages(chat_id, job["from_chat"], job["message_id"])
+                elif job["message_id"]:
+                    m = await app.copy_message(
+                        chat_id, job["from_chat"], job["message_id"], reply_markup=markup
+                    )
+                else:
+                    m = await app.send_message(chat_id, text=job["text"])
+            except FloodWait as e:
+                wait = int(e.value)
+                self.bucket.slow_down()
+                self.paused = max(self.paused, time.monotonic() + wait)
+                if wait > FLOOD_SKIP:
+                    job["failed"] += 1
+                    return True
+                continue
+            except GONE:
+                job["failed"] += 1
+                return False
+            except Exception:
+                job["failed"] += 1
+                return True
+            self.bucket.speed_up()
+            job["sent"] += 1
+            if job["pin"]:
+                try:
+                    await m.pin(disable_notification=job["pin"] != "loud")
+                    job["pinned"] += 1
+                except Exception:
+                    pass
+            return True
+
+    async def run_batch(self, job, batch, key, seen, markup):
+        slots = asyncio.Semaphore(config.BROADCAST_WORKERS)
+        gone = []
+
+        async def deliver(target):
+            async with slots:
+                if not await self.send(job, target, markup):
+                    gone.append(target)
+
+        targets = []
+        for doc in batch:
+            target = doc.get(key)
+            if target is None or target in seen:
+                continue
+            seen.add(target)
+            targets.append(int(target))
+        await asyncio.gather(*(deliver(target) for target in targets))
+        if gone and job["target"] == "users":
+            await usersdb.delete_many({"user_id": {"$in": gone}})
+            # so add_served_user stores them again if they come back
+            for user_id in gone:
+                settings.set("served_user", user_id, False)
+            await settings.changed()
+            job["pruned"] += len(gone)
+        job["cursor"] = batch[-1]["_id"]
+        await jobsdb.update_one(
+            {"_id": job["_id"]}, {"$set": {name: job[name] for name in COUNTERS}}
+        )
+
+    def progress(self, job, total, done, elapsed) -> str:
+        handled = job["sent"] + job["failed"]
+        speed = done / elapsed if elapsed > 0 else 0
+        eta = (total - handled) / speed if speed else None
+        return (
+            f"📣 <b>Broadcast to {job['target']}</b> : {handled}/{total}\n\n"
+            f"Sent : <code>{job['sent']}</code>\n"
+            f"Failed : <code>{job['failed']}</code>\n"
+            f"Removed : <code>{job['pruned']}</code>\n"
+            f"Pinned : <code>{job['pinned']}</code>\n\n"
+            f"Speed : <code>{speed:.1f}/s</code> (limit {self.bucket.rate:.1f}/s)\n"
+            f"ETA : <code>{seconds_to_min(eta) if eta else '-'}</code>"
+        )
+
+    async def run(self, job, report=None):
+        collection, key, query = TARGETS[job["target"]]
+        markup = None
+        try:
+            if job["message_id"] and not job["forward"]:
+                try:
+                    source = await app.get_messages(job["from_chat"], job["message_id"])
+                    markup = source.reply_markup
+                except Exception:
+                    pass
+            if report is None:
+                try:
+                    report = await app.get_messages(job["report_chat"], job["report_id"])
+                except Exception:
+                    report = None
+            if job["cursor"] is not None:
+                query = {**query, "_id": {"$gt": job["cursor"]}}
+            base = job["sent"] + job["failed"]
+            total = base + await collection.count_documents(query)
+            started = time.monotonic()
+            reported = started
+            seen = set()
+            batch = []
+            cursor = collection.find(query, {key: 1}).sort("_id", 1)
+            async for doc in cursor.batch_size(config.BROADCAST_BATCH):
+                batch.append(doc)
+                if len(batch) < config.BROADCAST_BATCH:
+                    continue
+                await self.run_batch(job, batch, key, seen, markup)
+                batch = []
+                now = time.monotonic()
+                if report and now - reported >= PROGRESS_EVERY:
+                    reported = now
+                    done = job["sent"] + job["failed"] - base
+                    edits.submit(
+                        report,
+                        "edit_text",
+                        BACKGROUND,
+                        text=self.progress(job, total, done, now - started),
+                    )
+            if batch:
+                await self.run_batch(job, batch, key, seen, markup)
+            job["status"] = "done"
+            await jobsdb.update_one({"_id": job["_id"]}, {"$set": {"status": "done"}})
+            if report:
+                done = job["sent"] + job["failed"] - base
+                await edits.submit(
+                    report,
+                    "edit_text",
+                    text=self.progress(job, total, done, time.monotonic() - started),
+                )
+            _ = get_string(job["lang"])
+            summary = (
+                _["broad_3"].format(job["sent"], job["pinned"])
+                if job["target"] == "chats"
+                else _["broad_4"].format(job["sent"])
+            )
+            try:
+                await app.send_message(job["report_chat"], summary)
+            except Exception:
+                pass
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            LOGGER(__name__).error(f"Broadcast {job['_id']} stopped: {e}")
+        finally:
+            self.jobs.pop(job["_id"], None)
+            self.running.pop(job["_id"], None)
+
+
+broadcaster = Broadcaster()
+
+
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
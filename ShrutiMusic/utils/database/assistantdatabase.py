@@ -20,8 +20,6 @@
 # Email: badboy809075@gmail.com
 
 
-import random
-
 from ShrutiMusic import userbot
 from ShrutiMusic.core.mongo import mongodb
 
@@ -31,16 +29,7 @@ assistantdict = {}
 
 
 async def get_client(assistant: int):
-    if int(assistant) == 1:
-        return userbot.one
-    elif int(assistant) == 2:
-        return userbot.two
-    elif int(assistant) == 3:
-        return userbot.three
-    elif int(assistant) == 4:
-        return userbot.four
-    elif int(assistant) == 5:
-        return userbot.five
+    return userbot.by_number(assistant)
 
 
 async def save_assistant(chat_id, number):
@@ -53,9 +42,10 @@ async def save_assistant(chat_id, number):
 
 
 async def set_assistant(chat_id):
+    from ShrutiMusic.core.call import Nand
     from ShrutiMusic.core.userbot import assistants
 
-    ran_assistant = random.choice(assistants)
+    ran_assistant = Nand.least_loaded(assistants)
     assistantdict[chat_id] = ran_assistant
     await db.update_one(
         {"chat_id": chat_id},
@@ -94,9 +84,10 @@ async def get_assistant(chat_id: int) -> str:
 
 
 async def set_calls_assistant(chat_id):
+    from ShrutiMusic.core.call import Nand
     from ShrutiMusic.core.userbot import assistants
 
-    ran_assistant = random.choice(assistants)
+    ran_assistant = Nand.least_loaded(assistants)
     assistantdict[chat_id] = ran_assistant
     await db.update_one(
         {"chat_id": chat_id},
@@ -126,16 +117,7 @@ async def group_assistant(self, chat_id: int) -> int:
             assis = assistant
         else:
             assis = await set_calls_assistant(chat_id)
-    if int(assis) == 1:
-        return self.one
-    elif int(assis) == 2:
-        return self.two
-    elif int(assis) == 3:
-        return self.three
-    elif int(assis) == 4:
-        return self.four
-    elif int(assis) == 5:
-        return self.five
+    return self.by_number(assis)
 
 
 # ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
@@ -0,0 +1,182 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+
+import asyncio
+import time
+from collections import OrderedDict
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+import config
+from ShrutiMusic.core.mongo import mongodb
+from ShrutiMusic.logging import LOGGER
+
+MISSING = object()
+
+# collection -> (cache namespace, field holding the key)
+WATCHED = {
+    "adminauth": ("nonadmin", "chat_id"),
+    "antigcst": ("antigcst", "chat_id"),
+    "assistants": ("assistant", "chat_id"),
+    "autoend": ("autoend", "chat_id"),
+    "autoleave": ("autoleave", "chat_id"),
+    "blockedusers": ("banned", "user_id"),
+    "cplaymode": ("cmode", "chat_id"),
+    "gban": ("gbanned", "user_id"),
+    "language": ("lang", "chat_id"),
+    "onoffper": ("onoff", "on_off"),
+    "playmode": ("playmode", "chat_id"),
+    "playtypedb": ("playtype", "chat_id"),
+    "skipmode": ("skipmode", "chat_id"),
+    "tgusersdb": ("served_user", "user_id"),
+    "upcount": ("upvote", "chat_id"),
+}
+
+versiondb = mongodb.settingsversion
+VERSION_POLL = 5
+
+
+class SettingsCache:
+    """
+    In-memory, write-through cache for per-chat and global settings.
+
+    Every namespace is an LRU bounded by SETTINGS_CACHE_SIZE whose entries
+    expire after SETTINGS_CACHE_TTL. Other bot processes are kept coherent
+    through a Mongo change stream, or through a shared version counter when
+    the server does not support change streams.
+    """
+
+    def __init__(self, size: int, ttl: int):
+        self.size = size
+        self.ttl = ttl
+        self.spaces = {}
+        self.hits = {}
+        self.misses = {}
+        self.mode = None
+        self.version = None
+        self._task = None
+
+    def get(self, space, key):
+        entries = self.spaces.get(space)
+        item = entries.get(key) if entries else None
+        if item is None or item[0] < time.monotonic():
+            self.misses[space] = self.misses.get(space, 0) + 1
+            return MISSING
+        entries.move_to_end(key)
+        self.hits[space] = self.hits.get(space, 0) + 1
+        return item[1]
+
+    def set(self, space, key, value):
+        entries = self.spaces.setdefault(space, OrderedDict())
+        entries[key] = (time.monotonic() + self.ttl, value)
+        entries.move_to_end(key)
+        if len(entries) > self.size:
+            entries.popitem(last=False)
+
+    def drop(self, space, key=MISSING):
+        if key is MISSING:
+            self.spaces.pop(space, None)
+        elif space in self.spaces:
+            self.spaces[space].pop(key, None)
+
+    def clear(self):
+        self.spaces.clear()
+
+    async def changed(self):
+        """Call after every settings write so other processes drop stale data."""
+        if self.mode != "version":
+            return
+        doc = await versiondb.find_one_and_update(
+            {"_id": "settings"},
+            {"$inc": {"v": 1}},
+            upsert=True,
+            return_document=True,
+        )
+        if self.version is not None and doc["v"] != self.version + 1:
+            self.clear()
+        self.version = doc["v"]
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def _watch(self):
+        pipeline = [{"$match": {"ns.coll": {"$in": list(WATCHED)}}}]
+        try:
+            async with mongodb.watch(pipeline, full_document="updateLookup") as stream:
+                self.mode = "stream"
+                LOGGER(__name__).info("Settings cache follows Mongo change streams.")
+                async for change in stream:
+                    self._apply(change)
+        except OperationFailure:
+            pass
+        except PyMongoError as e:
+            LOGGER(__name__).warning(f"Settings change stream stopped: {e}")
+        self.clear()
+        self.mode = "version"
+        LOGGER(__name__).info("Settings cache follows the shared version counter.")
+        while True:
+            try:
+                doc = await versiondb.find_one({"_id": "settings"})
+                version = doc["v"] if doc else 0
+                if self.version is not None and version != self.version:
+                    self.clear()
+                self.version = version
+            except PyMongoError:
+                self.clear()
+            await asyncio.sleep(VERSION_POLL)
+
+    def _apply(self, change):
+        space, field = WATCHED[change["ns"]["coll"]]
+        doc = change.get("fullDocument") or {}
+        if field in doc:
+            self.drop(space, doc[field])
+        else:
+            self.drop(space)
+
+    def stats(self) -> dict:
+        result = {}
+        for space in set(self.hits) | set(self.misses):
+            hits = self.hits.get(space, 0)
+            total = hits + self.misses.get(space, 0)
+            result[space] = {
+                "size": len(self.spaces.get(space, ())),
+                "hits": hits,
+                "hit_rate": round(hits * 100 / total, 2) if total else 0.0,
+            }
+        return result
+
+
+settings = SettingsCache(config.SETTINGS_CACHE_SIZE, config.SETTINGS_CACHE_TTL)
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -20,13 +20,13 @@
 # Email: badboy809075@gmail.com
 
 
-import random
 import asyncio
 from datetime import date
 from typing import Dict, List, Union
 
 from ShrutiMusic import userbot
 from ShrutiMusic.core.mongo import mongodb
+from ShrutiMusic.utils.database.cache import MISSING, settings
 
 authdb = mongodb.adminauth
 authuserdb = mongodb.authuser
@@ -49,60 +49,46 @@ sudoersdb = mongodb.sudoers
 usersdb = mongodb.tgusersdb
 
 # Shifting to memory [mongo sucks often]
+# Settings read from mongo are cached in `settings` (see cache.py),
+# only process-local runtime state stays in these lists/dicts.
 active = []
 activevideo = []
-assistantdict = {}
-autoend = {}
-autoleave = {}
-count = {}
-channelconnect = {}
-langm = {}
 loop = {}
-maintenance = []
-nonadmin = {}
 pause = {}
-playmode = {}
-playtype = {}
-skipmode = {}
 
 
 async def get_assistant_number(chat_id: int) -> str:
-    assistant = assistantdict.get(chat_id)
-    return assistant
+    assistant = settings.get("assistant", chat_id)
+    return None if assistant is MISSING else assistant
 
 
 async def get_client(assistant: int):
-    if int(assistant) == 1:
-        return userbot.one
-    elif int(assistant) == 2:
-        return userbot.two
-    elif int(assistant) == 3:
-        return userbot.three
-    elif int(assistant) == 4:
-        return userbot.four
-    elif int(assistant) == 5:
-        return userbot.five
+    return userbot.by_number(assistant)
 
 
 async def set_assistant_new(chat_id, number):
     number = int(number)
+    settings.set("assistant", chat_id, number)
     await assdb.update_one(
         {"chat_id": chat_id},
         {"$set": {"assistant": number}},
         upsert=True,
     )
+    await settings.changed()
 
 
 async def set_assistant(chat_id):
+    from ShrutiMusic.core.call import Nand
     from ShrutiMusic.core.userbot import assistants
 
-    ran_assistant = random.choice(assistants)
-    assistantdict[chat_id] = ran_assistant
+    ran_assistant = Nand.least_loaded(assistants)
+    settings.set("assistant", chat_id, ran_assistant)
     await assdb.update_one(
         {"chat_id": chat_id},
         {"$set": {"assistant": ran_assistant}},
         upsert=True,
     )
+    await settings.changed()
     userbot = await get_client(ran_assistant)
     return userbot
 
@@ -110,7 +96,7 @@ async def set_assistant(chat_id):
 async def get_assistant(chat_id: int) -> str:
     from ShrutiMusic.core.userbot import assistants
 
-    assistant = assistantdict.get(chat_id)
+    assistant = await get_assistant_number(chat_id)
     if not assistant:
         dbassistant = await assdb.find_one({"chat_id": chat_id})
         if not dbassistant:
@@ -119,7 +105,7 @@ async def get_assistant(chat_id: int) -> str:
         else:
             got_assis = dbassistant["assistant"]
             if got_assis in assistants:
-                assistantdict[chat_id] = got_assis
+                settings.set("assistant", chat_id, got_assis)
                 userbot = await get_client(got_assis)
                 return userbot
             else:
@@ -127,6 +113,12 @@ async def get_assistant(chat_id: int) -> str:
                 return userbot
     else:
         if assistant in assistants:
+            if not await is_active_chat(chat_id):
+                from ShrutiMusic.core.call import Nand
+
+                # idle chats are free to move off a crowded assistant
+                if Nand.should_migrate(assistant, assistants):
+                    return await set_assistant(chat_id)
             userbot = await get_client(assistant)
             return userbot
         else:
@@ -135,22 +127,24 @@ async def get_assistant(chat_id: int) -> str:
 
 
 async def set_calls_assistant(chat_id):
+    from ShrutiMusic.core.call import Nand
     from ShrutiMusic.core.userbot import assistants
 
-    ran_assistant = random.choice(assistants)
-    assistantdict[chat_id] = ran_assistant
+    ran_assistant = Nand.least_loaded(assistants)
+    settings.set("assistant", chat_id, ran_assistant)
     await assdb.update_one(
         {"chat_id": chat_id},
         {"$set": {"assistant": ran_assistant}},
         upsert=True,
     )
+    await settings.changed()
     return ran_assistant
 
 
 async def group_assistant(self, chat_id: int) -> int:
     from ShrutiMusic.core.userbot import assistants
 
-    assistant = assistantdict.get(chat_id)
+    assistant = await get_assistant_number(chat_id)
     if not assistant:
         dbassistant = await assdb.find_one({"chat_id": chat_id})
         if not dbassistant:
@@ -158,7 +152,7 @@ async def group_assistant(self, chat_id: int) -> int:
         else:
             assis = dbassistant["assistant"]
             if assis in assistants:
-                assistantdict[chat_id] = assis
+                settings.set("assistant", chat_id, assis)
                 assis = assis
             else:
                 assis = await set_calls_assistant(chat_id)
@@ -167,95 +161,97 @@ async def group_assistant(self, chat_id: int) -> int:
             assis = assistant
         else:
             assis = await set_calls_assistant(chat_id)
-    if int(assis) == 1:
-        return self.one
-    elif int(assis) == 2:
-        return self.two
-    elif int(assis) == 3:
-        return self.three
-    elif int(assis) == 4:
-        return self.four
-    elif int(assis) == 5:
-        return self.five
+    return self.by_number(assis)
 
 
 async def is_skipmode(chat_id: int) -> bool:
-    mode = skipmode.get(chat_id)
-    if not mode:
+    mode = settings.get("skipmode", chat_id)
+    if mode is MISSING:
         user = await skipdb.find_one({"chat_id": chat_id})
-        if not user:
-            skipmode[chat_id] = True
-            return True
-        skipmode[chat_id] = False
-        return False
+        mode = not user
+        settings.set("skipmode", chat_id, mode)
     return mode
 
 
 async def skip_on(chat_id: int):
-    skipmode[chat_id] = True
+    settings.set("skipmode", chat_id, True)
     user = await skipdb.find_one({"chat_id": chat_id})
     if user:
-        return await skipdb.delete_one({"chat_id": chat_id})
+        await skipdb.delete_one({"chat_id": chat_id})
+        await settings.changed()
 
 
 async def skip_off(chat_id: int):
-    skipmode[chat_id] = False
+    settings.set("skipmode", chat_id, False)
     user = await skipdb.find_one({"chat_id": chat_id})
     if not user:
-        return await skipdb.insert_one({"chat_id": chat_id})
+        await skipdb.insert_one({"chat_id": chat_id})
+        await settings.changed()
 
 
 async def get_upvote_count(chat_id: int) -> int:
-    mode = count.get(chat_id)
-    if not mode:
+    mode = settings.get("upvote", chat_id)
+    if mode is MISSING:
         mode = await countdb.find_one({"chat_id": chat_id})
-        if not mode:
-            return 5
-        count[chat_id] = mode["mode"]
-        return mode["mode"]
+        mode = mode["mode"] if mode else 5
+        settings.set("upvote", chat_id, mode)
     return mode
 
 
 async def set_upvotes(chat_id: int, mode: int):
-    count[chat_id] = mode
+    settings.set("upvote", chat_id, mode)
     await countdb.update_one(
         {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
     )
+    await settings.changed()
 
 
 async def is_autoend() -> bool:
     chat_id = 1234
-    user = await autoenddb.find_one({"chat_id": chat_id})
-    if not user:
-        return False
-    return True
+    mode = settings.get("autoend", chat_id)
+    if mode is MISSING:
+        user = await autoenddb.find_one({"chat_id": chat_id})
+        mode = bool(user)
+        settings.set("autoend", chat_id, mode)
+    return mode
 
 
 async def autoend_on():
     chat_id = 1234
+    settings.set("autoend", chat_id, True)
     await autoenddb.insert_one({"chat_id": chat_id})
+    await settings.changed()
 
 
 async def autoend_off():
     chat_id = 1234
+    settings.set("autoend", chat_id, False)
     await autoenddb.delete_one({"chat_id": chat_id})
+    await settings.changed()
+
 
 async def is_autoleave() -> bool:
     chat_id = 1234
-    user = await autoleavedb.find_one({"chat_id": chat_id})
-    if not user:
-        return False
-    return True
+    mode = settings.get("autoleave", chat_id)
+    if mode is MISSING:
+        user = await autoleavedb.find_one({"chat_id": chat_id})
+        mode = bool(user)
+        settings.set("autoleave", chat_id, mode)
+    return mode
 
 
 async def autoleave_on():
     chat_id = 1234
+    settings.set("autoleave", chat_id, True)
     await autoleavedb.insert_one({"chat_id": chat_id})
+    await settings.changed()
 
 
 async def autoleave_off():
     chat_id = 1234
+    settings.set("autoleave", chat_id, False)
     await autoleavedb.delete_one({"chat_id": chat_id})
+    await settings.changed()
 
 
 async def get_loop(chat_id: int) -> int:
@@ -270,76 +266,69 @@ async def set_loop(chat_id: int, mode: int):
 
 
 async def get_cmode(chat_id: int) -> int:
-    mode = channelconnect.get(chat_id)
-    if not mode:
+    mode = settings.get("cmode", chat_id)
+    if mode is MISSING:
         mode = await channeldb.find_one({"chat_id": chat_id})
-        if not mode:
-            return None
-        channelconnect[chat_id] = mode["mode"]
-        return mode["mode"]
+        mode = mode["mode"] if mode else None
+        settings.set("cmode", chat_id, mode)
     return mode
 
 
 async def set_cmode(chat_id: int, mode: int):
-    channelconnect[chat_id] = mode
+    settings.set("cmode", chat_id, mode)
     await channeldb.update_one(
         {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
     )
+    await settings.changed()
 
 
 async def get_playtype(chat_id: int) -> str:
-    mode = playtype.get(chat_id)
-    if not mode:
+    mode = settings.get("playtype", chat_id)
+    if mode is MISSING:
         mode = await playtypedb.find_one({"chat_id": chat_id})
-        if not mode:
-            playtype[chat_id] = "Everyone"
-            return "Everyone"
-        playtype[chat_id] = mode["mode"]
-        return mode["mode"]
+        mode = mode["mode"] if mode else "Everyone"
+        settings.set("playtype", chat_id, mode)
     return mode
 
 
 async def set_playtype(chat_id: int, mode: str):
-    playtype[chat_id] = mode
+    settings.set("playtype", chat_id, mode)
     await playtypedb.update_one(
         {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
     )
+    await settings.changed()
 
 
 async def get_playmode(chat_id: int) -> str:
-    mode = playmode.get(chat_id)
-    if not mode:
+    mode = settings.get("playmode", chat_id)
+    if mode is MISSING:
         mode = await playmodedb.find_one({"chat_id": chat_id})
-        if not mode:
-            playmode[chat_id] = "Direct"
-            return "Direct"
-        playmode[chat_id] = mode["mode"]
-        return mode["mode"]
+        mode = mode["mode"] if mode else "Direct"
+        settings.set("playmode", chat_id, mode)
     return mode
 
 
 async def set_playmode(chat_id: int, mode: str):
-    playmode[chat_id] = mode
+    settings.set("playmode", chat_id, mode)
     await playmodedb.update_one(
         {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
     )
+    await settings.changed()
 
 
 async def get_lang(chat_id: int) -> str:
-    mode = langm.get(chat_id)
-    if not mode:
+    mode = settings.get("lang", chat_id)
+    if mode is MISSING:
         lang = await langdb.find_one({"chat_id": chat_id})
-        if not lang:
-            langm[chat_id] = "en"
-            return "en"
-        langm[chat_id] = lang["lang"]
-        return lang["lang"]
+        mode = lang["lang"] if lang else "en"
+        settings.set("lang", chat_id, mode)
     return mode
 
 
 async def set_lang(chat_id: int, lang: str):
-    langm[chat_id] = lang
+    settings.set("lang", chat_id, lang)
     await langdb.update_one({"chat_id": chat_id}, {"$set": {"lang": lang}}, upsert=True)
+    await settings.changed()
 
 
 async def is_music_playing(chat_id: int) -> bool:
@@ -400,102 +389,82 @@ async def remove_active_video_chat(chat_id: int):
 
 
 async def check_nonadmin_chat(chat_id: int) -> bool:
-    user = await authdb.find_one({"chat_id": chat_id})
-    if not user:
-        return False
-    return True
+    mode = settings.get("nonadmin", chat_id)
+    if mode is MISSING:
+        user = await authdb.find_one({"chat_id": chat_id})
+        mode = bool(user)
+        settings.set("nonadmin", chat_id, mode)
+    return mode
 
 
 async def is_nonadmin_chat(chat_id: int) -> bool:
-    mode = nonadmin.get(chat_id)
-    if not mode:
-        user = await authdb.find_one({"chat_id": chat_id})
-        if not user:
-            nonadmin[chat_id] = False
-            return False
-        nonadmin[chat_id] = True
-        return True
-    return mode
+    return await check_nonadmin_chat(chat_id)
 
 
 async def add_nonadmin_chat(chat_id: int):
-    nonadmin[chat_id] = True
     is_admin = await check_nonadmin_chat(chat_id)
     if is_admin:
         return
-    return await authdb.insert_one({"chat_id": chat_id})
+    settings.set("nonadmin", chat_id, True)
+    await authdb.insert_one({"chat_id": chat_id})
+    await settings.changed()
 
 
 async def remove_nonadmin_chat(chat_id: int):
-    nonadmin[chat_id] = False
     is_admin = await check_nonadmin_chat(chat_id)
     if not is_admin:
         return
-    return await authdb.delete_one({"chat_id": chat_id})
+    settings.set("nonadmin", chat_id, False)
+    await authdb.delete_one({"chat_id": chat_id})
+    await settings.changed()
 
 
 async def is_on_off(on_off: int) -> bool:
-    onoff = await onoffdb.find_one({"on_off": on_off})
-    if not onoff:
-        return False
-    return True
+    mode = settings.get("onoff", on_off)
+    if mode is MISSING:
+        onoff = await onoffdb.find_one({"on_off": on_off})
+        mode = bool(onoff)
+        settings.set("onoff", on_off, mode)
+    return mode
 
 
 async def add_on(on_off: int):
     is_on = await is_on_off(on_off)
     if is_on:
         return
-    return await onoffdb.insert_one({"on_off": on_off})
+    settings.set("onoff", on_off, True)
+    await onoffdb.insert_one({"on_off": on_off})
+    await settings.changed()
 
 
 async def add_off(on_off: int):
     is_off = await is_on_off(on_off)
     if not is_off:
         return
-    return await onoffdb.delete_one({"on_off": on_off})
+    settings.set("onoff", on_off, False)
+    await onoffdb.delete_one({"on_off": on_off})
+    await settings.changed()
 
 
 async def is_maintenance():
-    if not maintenance:
-        get = await onoffdb.find_one({"on_off": 1})
-        if not get:
-            maintenance.clear()
-            maintenance.append(2)
-            return True
-        else:
-            maintenance.clear()
-            maintenance.append(1)
-            return False
-    else:
-        if 1 in maintenance:
-            return False
-        else:
-            return True
+    return not await is_on_off(1)
 
 
 async def maintenance_off():
-    maintenance.clear()
-    maintenance.append(2)
-    is_off = await is_on_off(1)
-    if not is_off:
-        return
-    return await onoffdb.delete_one({"on_off": 1})
+    await add_off(1)
 
 
 async def maintenance_on():
-    maintenance.clear()
-    maintenance.append(1)
-    is_on = await is_on_off(1)
-    if is_on:
-        return
-    return await onoffdb.insert_one({"on_off": 1})
+    await add_on(1)
 
 
 async def is_served_user(user_id: int) -> bool:
-    user = await usersdb.find_one({"user_id": user_id})
-    if not user:
-        return False
-    return True
+    mode = settings.get("served_user", user_id)
+    if mode is MISSING:
+        user = await usersdb.find_one({"user_id": user_id})
+        mode = bool(user)
+        settings.set("served_user", user_id, mode)
+    return mode
 
 
 async def get_served_users() -> list:
@@ -509,7 +478,10 @@ async def add_served_user(user_id: int):
     is_served = await is_served_user(user_id)
     if is_served:
         return
-    return await usersdb.insert_one({"user_id": user_id})
+    settings.set("served_user", user_id, True)
+    result = await usersdb.insert_one({"user_id": user_id})
+    await settings.changed()
+    return result
 
 
 async def get_served_chats() -> list:
@@ -610,24 +582,30 @@ async def get_gbanned() -> list:
 
 
 async def is_gbanned_user(user_id: int) -> bool:
-    user = await gbansdb.find_one({"user_id": user_id})
-    if not user:
-        return False
-    return True
+    mode = settings.get("gbanned", user_id)
+    if mode is MISSING:
+        user = await gbansdb.find_one({"user_id": user_id})
+        mode = bool(user)
+        settings.set("gbanned", user_id, mode)
+    return mode
 
 
 async def add_gban_user(user_id: int):
     is_gbanned = await is_gbanned_user(user_id)
     if is_gbanned:
         return
-    return await gbansdb.insert_one({"user_id": user_id})
+    settings.set("gbanned", user_id, True)
+    await gbansdb.insert_one({"user_id": user_id})
+    await settings.changed()
 
 
 async def remove_gban_user(user_id: int):
     is_gbanned = await is_gbanned_user(user_id)
     if not is_gbanned:
         return
-    return await gbansdb.delete_one({"user_id": user_id})
+    settings.set("gbanned", user_id, False)
+    await gbansdb.delete_one({"user_id": user_id})
+    await settings.changed()
 
 
 async def get_sudoers() -> list:
@@ -664,30 +642,34 @@ async def get_banned_users() -> list:
 
 
 async def get_banned_count() -> int:
-    users = blockeddb.find({"user_id": {"$gt": 0}})
-    users = await users.to_list(length=100000)
-    return len(users)
+    return await blockeddb.count_documents({"user_id": {"$gt": 0}})
 
 
 async def is_banned_user(user_id: int) -> bool:
-    user = await blockeddb.find_one({"user_id": user_id})
-    if not user:
-        return False
-    return True
+    mode = settings.get("banned", user_id)
+    if mode is MISSING:
+        user = await blockeddb.find_one({"user_id": user_id})
+        mode = bool(user)
+        settings.set("banned", user_id, mode)
+    return mode
 
 
 async def add_banned_user(user_id: int):
     is_gbanned = await is_banned_user(user_id)
     if is_gbanned:
         return
-    return await blockeddb.insert_one({"user_id": user_id})
+    settings.set("banned", user_id, True)
+    await blockeddb.insert_one({"user_id": user_id})
+    await settings.changed()
 
 
 async def remove_banned_user(user_id: int):
     is_gbanned = await is_banned_user(user_id)
     if not is_gbanned:
         return
-    return await blockeddb.delete_one({"user_id": user_id})
+    settings.set("banned", user_id, False)
+    await blockeddb.delete_one({"user_id": user_id})
+    await settings.changed()
 
 
 # ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
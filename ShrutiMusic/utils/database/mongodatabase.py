@@ -88,6 +88,12 @@ async def delete_playlist(chat_id: int, name: str) -> bool:
     return False
 
 
+async def _iter_ids(collection, key: str, query: dict, batch_size: int):
+    cursor = collection.find(query, {key: 1, "_id": 0}).batch_size(batch_size)
+    async for doc in cursor:
+        yield doc[key]
+
+
 # Users
 
 
@@ -105,6 +111,15 @@ async def get_served_users() -> list:
     return users_list
 
 
+async def iter_served_users(batch_size: int = 1000):
+    async for user_id in _iter_ids(usersdb, "user_id", {"user_id": {"$gt": 0}}, batch_size):
+        yield user_id
+
+
+async def count_served_users() -> int:
+    return await usersdb.count_documents({"user_id": {"$gt": 0}})
+
+
 async def add_served_user(user_id: int):
     is_served = await is_served_user(user_id)
     if is_served:
@@ -126,6 +141,15 @@ async def get_served_chats() -> list:
     return chats_list
 
 
+async def iter_served_chats(batch_size: int = 1000):
+    async for chat_id in _iter_ids(chatsdb, "chat_id", {"chat_id": {"$lt": 0}}, batch_size):
+        yield chat_id
+
+
+async def count_served_chats() -> int:
+    return await chatsdb.count_documents({"chat_id": {"$lt": 0}})
+
+
 async def is_served_chat(chat_id: int) -> bool:
     chat = await chatsdb.find_one({"chat_id": chat_id})
     if not chat:
@@ -154,6 +178,17 @@ async def blacklisted_chats() -> list:
     return chats_list
 
 
+async def iter_blacklisted_chats(batch_size: int = 1000):
+    async for chat_id in _iter_ids(
+        blacklist_chatdb, "chat_id", {"chat_id": {"$lt": 0}}, batch_size
+    ):
+        yield chat_id
+
+
+async def is_blacklisted_chat(chat_id: int) -> bool:
+    return bool(await blacklist_chatdb.find_one({"chat_id": chat_id}, {"_id": 1}))
+
+
 async def blacklist_chat(chat_id: int) -> bool:
     if not await blacklist_chatdb.find_one({"chat_id": chat_id}):
         await blacklist_chatdb.insert_one({"chat_id": chat_id})
@@ -178,6 +213,15 @@ async def get_private_served_chats() -> list:
     return chats_list
 
 
+async def iter_private_served_chats(batch_size: int = 1000):
+    async for chat_id in _iter_ids(privatedb, "chat_id", {"chat_id": {"$lt": 0}}, batch_size):
+        yield chat_id
+
+
+async def count_private_served_chats() -> int:
+    return await privatedb.count_documents({"chat_id": {"$lt": 0}})
+
+
 async def is_served_private_chat(chat_id: int) -> bool:
     chat = await privatedb.find_one({"chat_id": chat_id})
     if not chat:
@@ -260,6 +304,15 @@ async def get_gbanned() -> list:
     return results
 
 
+async def iter_gbanned(batch_size: int = 1000):
+    async for user_id in _iter_ids(gbansdb, "user_id", {"user_id": {"$gt": 0}}, batch_size):
+        yield user_id
+
+
+async def count_gbanned() -> int:
+    return await gbansdb.count_documents({"user_id": {"$gt": 0}})
+
+
 async def is_gbanned_user(user_id: int) -> bool:
     user = await gbansdb.find_one({"user_id": user_id})
     if not user:
@@ -434,10 +487,13 @@ async def get_banned_users() -> list:
     return results
 
 
+async def iter_banned_users(batch_size: int = 1000):
+    async for user_id in _iter_ids(blockeddb, "user_id", {"user_id": {"$gt": 0}}, batch_size):
+        yield user_id
+
+
 async def get_banned_count() -> int:
-    users = blockeddb.find({"user_id": {"$gt": 0}})
-    users = await users.to_list(length=100000)
-    return len(users)
+    return await blockeddb.count_documents({"user_id": {"$gt": 0}})
 
 
 async def is_banned_user(user_id: int) -> bool:
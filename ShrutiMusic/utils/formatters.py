@@ -21,8 +21,11 @@
 
 
 import json
+import os
 import subprocess
 
+from ShrutiMusic.utils.stream.seekindex import indexed_duration, remember_duration
+
 
 def get_readable_time(seconds: int) -> str:
     count = 0
@@ -139,6 +142,10 @@ def speed_converter(seconds, speed):
 
 
 def check_duration(file_path):
+    duration = indexed_duration(file_path)
+    if duration is not None:
+        return duration
+
     command = [
         "ffprobe",
         "-loglevel",
@@ -154,16 +161,18 @@ def check_duration(file_path):
     out, err = pipe.communicate()
     _json = json.loads(out)
 
-    if "format" in _json:
-        if "duration" in _json["format"]:
-            return float(_json["format"]["duration"])
-
-    if "streams" in _json:
+    duration = "Unknown"
+    if "format" in _json and "duration" in _json["format"]:
+        duration = float(_json["format"]["duration"])
+    elif "streams" in _json:
         for s in _json["streams"]:
             if "duration" in s:
-                return float(s["duration"])
+                duration = float(s["duration"])
+                break
 
-    return "Unknown"
+    if duration != "Unknown" and not os.path.isfile(file_path):
+        remember_duration(file_path, duration)
+    return duration
 
 
 formats = [
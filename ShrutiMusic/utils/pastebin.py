@@ -20,19 +20,18 @@
 # Email: badboy809075@gmail.com
 
 
-import aiohttp
+from ShrutiMusic.core.http import http
 
 BASE = "https://batbin.me/"
 
 
-async def post(url: str, *args, **kwargs):
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, *args, **kwargs) as resp:
-            try:
-                data = await resp.json()
-            except Exception:
-                data = await resp.text()
-        return data
+async def post(url: str, **kwargs):
+    async with http.stream("POST", url, **kwargs) as resp:
+        try:
+            data = await resp.json()
+        except Exception:
+            data = await resp.text()
+    return data
 
 
 async def NandBin(text):
@@ -24,6 +24,10 @@ import os
 
 from config import autoclean
 
+from ShrutiMusic.utils.stream.cache import media_cache
+from ShrutiMusic.utils.stream.seekindex import drop_index
+from ShrutiMusic.utils.stream.speed import speed_cache
+
 
 async def auto_clean(popped):
     try:
@@ -31,11 +35,15 @@ async def auto_clean(popped):
         autoclean.remove(rem)
         count = autoclean.count(rem)
         if count == 0:
-            if "vid_" not in rem or "live_" not in rem or "index_" not in rem:
+            if media_cache.owns(rem):
+                media_cache.trim()
+            elif "vid_" not in rem or "live_" not in rem or "index_" not in rem:
                 try:
                     os.remove(rem)
                 except:
                     pass
+                speed_cache.forget(rem)
+                drop_index(rem)
     except:
         pass
 
@@ -0,0 +1,224 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+
+import os
+import re
+import time
+from collections import OrderedDict
+
+import config
+from config import autoclean
+
+from ShrutiMusic.logging import LOGGER
+from ShrutiMusic.misc import db
+from ShrutiMusic.utils.stream.seekindex import drop_index, schedule_index
+
+CACHE_FOLDER = "downloads"
+
+AUDIO_EXTS = ["mp3", "m4a", "webm", "opus", "ogg"]
+VIDEO_EXTS = ["mp4", "mkv"]
+
+_vid_re = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
+
+def media_kind(video) -> str:
+    return "video" if video else "audio"
+
+
+class MediaCache:
+    """
+    On-disk cache of downloaded YouTube media keyed by (video id, kind).
+
+    Files live at downloads/<id>.<ext> exactly as the download backends
+    write them, so a hit is just a local path. Entries still referenced
+    by a queue are never evicted: by (video id, kind) from the queued
+    entries in misc.db, which covers the playing track and prefetched
+    ones, or by path through config.autoclean.
+    """
+
+    def __init__(self, folder: str, max_bytes: int, policy: str = "lru"):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.policy = policy if policy in ("lru", "lfu") else "lru"
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    def _load(self):
+        if not os.path.isdir(self.folder):
+            return
+        found = []
+        for name in os.listdir(self.folder):
+            stem, _, ext = name.rpartition(".")
+            if not _vid_re.match(stem):
+                continue
+            if ext in VIDEO_EXTS:
+                kind = "video"
+            elif ext in AUDIO_EXTS:
+                kind = "audio"
+            else:
+                continue
+            path = os.path.join(self.folder, name)
+            try:
+                found.append((os.path.getmtime(path), stem, kind, path))
+            except OSError:
+                continue
+        for mtime, stem, kind, path in sorted(found):
+            self._add((stem, kind), path, mtime)
+        if found:
+            LOGGER(__name__).info(
+                f"Media cache loaded {len(self.entries)} files ({self.size // (1024 * 1024)} MB)."
+            )
+        self.trim()
+
+    def _add(self, key, path, stamp=None):
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        old = self.entries.pop(key, None)
+        if old:
+            self.size -= old["size"]
+        self.entries[key] = {
+            "path": path,
+            "size": size,
+            "hits": 0,
+            "last": stamp or time.time(),
+        }
+        self.size += size
+
+    def _drop(self, key):
+        entry = self.entries.pop(key, None)
+        if entry:
+            self.size -= entry["size"]
+        return entry
+
+    def queued(self) -> set:
+        """(video id, kind) of every YouTube entry in any chat's queue."""
+        keys = set()
+        for queue in list(db.values()):
+            for entry in queue or []:
+                if entry.get("vidid") and "live_" not in str(entry.get("file")):
+                    keys.add(
+                        (entry["vidid"], media_kind(str(entry.get("streamtype")) == "video"))
+                    )
+        return keys
+
+    def refs(self, path) -> int:
+        return autoclean.count(path)
+
+    def has(self, vidid: str, video=None) -> bool:
+        entry = self.entries.get((vidid, media_kind(video)))
+        return bool(entry) and os.path.exists(entry["path"])
+
+    def get(self, vidid: str, video=None):
+        key = (vidid, media_kind(video))
+        entry = self.entries.get(key)
+        if entry and not os.path.exists(entry["path"]):
+            self._drop(key)
+            entry = None
+        if not entry:
+            self.misses += 1
+            return None
+        entry["hits"] += 1
+        entry["last"] = time.time()
+        self.entries.move_to_end(key)
+        self.hits += 1
+        schedule_index(entry["path"])
+        return entry["path"]
+
+    def put(self, vidid: str, video, path):
+        if not path or not os.path.isfile(path):
+            return path
+        self._add((vidid, media_kind(video)), path)
+        schedule_index(path)
+        self.trim()
+        return path
+
+    def owns(self, path) -> bool:
+        for entry in self.entries.values():
+            if entry["path"] == path:
+                return True
+        return False
+
+    def _victim(self, queued: set):
+        candidates = [
+            (key, entry)
+            for key, entry in self.entries.items()
+            if key not in queued and not self.refs(entry["path"])
+        ]
+        if not candidates:
+            return None
+        if self.policy == "lfu":
+            return min(candidates, key=lambda x: (x[1]["hits"], x[1]["last"]))[0]
+        return candidates[0][0]
+
+    def trim(self):
+        if self.size <= self.max_bytes:
+            return
+        queued = self.queued()
+        while self.size > self.max_bytes:
+            key = self._victim(queued)
+            if key is None:
+                break
+            entry = self._drop(key)
+            self.evictions += 1
+            try:
+                os.remove(entry["path"])
+            except OSError:
+                pass
+            drop_index(entry["path"])
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "files": len(self.entries),
+            "size": self.size,
+            "max_size": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits * 100 / total, 2) if total else 0.0,
+        }
+
+
+media_cache = MediaCache(
+    CACHE_FOLDER,
+    config.MEDIA_CACHE_SIZE * 1024 * 1024,
+    config.MEDIA_CACHE_POLICY,
+)
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
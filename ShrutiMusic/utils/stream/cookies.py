@@ -0,0 +1,211 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import math
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+import config
+from ShrutiMusic.logging import LOGGER
+
+COOKIE_DIR = "ShrutiMusic/cookies"
+# failures that say something about the cookie rather than the video
+COOKIE_ERRORS = re.compile(
+    r"sign in|not a bot|login required|cookies are no longer valid|"
+    r"too many requests|rate.?limit|\b429\b|\b403\b|forbidden",
+    re.IGNORECASE,
+)
+
+
+class CookiePool:
+    """
+    The cookie files under ShrutiMusic/cookies with per-file health.
+
+    The directory is re-scanned at most every COOKIE_RESCAN seconds instead
+    of on every pick. Picks are weighted by smoothed success rate, latency
+    and how many jobs already hold the file. COOKIE_FAIL_LIMIT cookie errors
+    in a row (sign-in walls, bot checks, 429/403) put a file in quarantine
+    for COOKIE_COOLDOWN seconds, doubling on every repeat up to
+    COOKIE_MAX_COOLDOWN. A success or replacing the file clears it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # file name -> health dict
+        self.cookies = {}
+        self.scanned = None
+        self.lock = threading.Lock()
+
+    def _new(self, mtime: float) -> dict:
+        return {
+            "ok": 0,
+            "fail": 0,
+            "streak": 0,
+            "strikes": 0,
+            "until": 0.0,
+            "avg": None,
+            "busy": 0,
+            "mtime": mtime,
+            "released": 0.0,
+            "error": None,
+        }
+
+    def _scan(self):
+        now = time.monotonic()
+        if self.scanned is not None and now - self.scanned < config.COOKIE_RESCAN:
+            return
+        self.scanned = now
+        found = {}
+        try:
+            with os.scandir(self.path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".txt") and entry.is_file():
+                        found[entry.name] = entry.stat().st_mtime
+        except FileNotFoundError:
+            pass
+        for name in list(self.cookies):
+            if name not in found:
+                self.cookies.pop(name)
+        for name, mtime in found.items():
+            state = self.cookies.get(name)
+            if state is None:
+                self.cookies[name] = self._new(mtime)
+            elif mtime != state["mtime"]:
+                # yt-dlp writes the jar back while it holds the file, anything
+                # newer than the last release is a replacement from outside
+                if not state["busy"] and mtime > state["released"] + 1:
+                    self.cookies[name] = self._new(mtime)
+                else:
+                    state["mtime"] = mtime
+
+    def _weight(self, state: dict) -> float:
+        rate = (state["ok"] + 1) / (state["ok"] + state["fail"] + 2)
+        latency = max(state["avg"] or 1.0, 0.5)
+        return rate / latency / (1 + state["busy"])
+
+    def acquire(self):
+        """Path of a cookie file to use, None when there are none. Pair with release()."""
+        with self.lock:
+            self._scan()
+            if not self.cookies:
+                return None
+            now = time.time()
+            ready = [name for name, s in self.cookies.items() if s["until"] <= now]
+            if ready:
+                weights = [self._weight(self.cookies[name]) for name in ready]
+                name = random.choices(ready, weights=weights)[0]
+            else:
+                # everything is cooling down, the one closest to done beats nothing
+                name = min(self.cookies, key=lambda n: self.cookies[n]["until"])
+            self.cookies[name]["busy"] += 1
+            return os.path.join(self.path, name)
+
+    def release(self, path: str, ok: bool, latency: float = 0.0, error=None):
+        """Record how a job with `path` went. Errors not about the cookie count as neither."""
+        with self.lock:
+            state = self.cookies.get(os.path.basename(path))
+            if state is None:
+                return
+            state["busy"] = max(0, state["busy"] - 1)
+            state["released"] = time.time()
+            if ok:
+                state["ok"] += 1
+                state["streak"] = 0
+                state["strikes"] = 0
+                state["until"] = 0.0
+                if state["avg"] is None:
+                    state["avg"] = latency
+                else:
+                    state["avg"] = 0.8 * state["avg"] + 0.2 * latency
+                return
+            if error is None or not COOKIE_ERRORS.search(str(error)):
+                return
+            state["fail"] += 1
+            state["streak"] += 1
+            state["error"] = str(error)[:200]
+            # a cookie back from quarantine gets one chance
+            if state["streak"] < config.COOKIE_FAIL_LIMIT and not state["strikes"]:
+                return
+            cooldown = min(
+                config.COOKIE_COOLDOWN * 2 ** state["strikes"], config.COOKIE_MAX_COOLDOWN
+            )
+            state["strikes"] += 1
+            state["streak"] = 0
+            state["until"] = time.time() + cooldown
+            LOGGER(__name__).warning(
+                f"Cookie {os.path.basename(path)} quarantined for {cooldown}s: {state['error']}"
+            )
+
+    @contextmanager
+    def lease(self):
+        """
+        Yield a cookie path (or None) and record the outcome of the block:
+        returning counts as a success, raising as a failure.
+        """
+        path = self.acquire()
+        started = time.monotonic()
+        try:
+            yield path
+        except BaseException as e:
+            if path:
+                self.release(path, False, error=e)
+            raise
+        if path:
+            self.release(path, True, time.monotonic() - started)
+
+    def health(self) -> list:
+        with self.lock:
+            self._scan()
+            now = time.time()
+            return [
+                {
+                    "name": name,
+                    "ok": s["ok"],
+                    "fail": s["fail"],
+                    "avg": s["avg"],
+                    "busy": s["busy"],
+                    "cooldown": max(0, math.ceil(s["until"] - now)),
+                    "error": s["error"],
+                }
+                for name, s in sorted(self.cookies.items())
+            ]
+
+
+cookie_pool = CookiePool(COOKIE_DIR)
+
+
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
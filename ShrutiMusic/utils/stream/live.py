@@ -0,0 +1,133 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import asyncio
+import re
+import time
+
+import config
+from ShrutiMusic.logging import LOGGER
+from ShrutiMusic.misc import db
+from ShrutiMusic.utils.stream.singleflight import flights
+
+# googlevideo urls carry their expiry as ?expire=<ts> or /expire/<ts>/
+EXPIRE = re.compile(r"expire[=/](\d+)")
+# a cached url with less life than this left is resolved again before use
+MIN_REMAINING = 60
+
+
+def expiry_of(url: str, now: float) -> float:
+    match = EXPIRE.search(url)
+    if match:
+        return int(match.group(1))
+    return now + config.LIVE_URL_TTL
+
+
+def queued(vidid: str) -> bool:
+    entry = f"live_{vidid}"
+    return any(
+        track.get("file") == entry for queue in list(db.values()) for track in queue or []
+    )
+
+
+class LiveUrls:
+    """
+    Playable HLS/DASH urls of live streams keyed by video id.
+
+    A url is kept until the expiry googlevideo embeds in it. While some chat
+    still has the stream queued it is re-resolved LIVE_URL_REFRESH seconds
+    before that, so track changes into a live entry never wait on yt-dlp.
+    Concurrent resolves of one id share a single extraction.
+    """
+
+    def __init__(self):
+        # vidid -> (url, expires)
+        self.entries = {}
+        self.timers = {}
+
+    async def _resolve(self, vidid: str, fetch):
+        url = await fetch(vidid)
+        now = time.time()
+        expires = expiry_of(url, now)
+        self.entries[vidid] = (url, expires)
+        self._schedule(vidid, fetch, expires - now)
+        return url
+
+    def _schedule(self, vidid: str, fetch, lifetime: float):
+        timer = self.timers.pop(vidid, None)
+        if timer:
+            timer.cancel()
+        delay = max(lifetime - config.LIVE_URL_REFRESH, lifetime / 2, 1)
+        self.timers[vidid] = asyncio.get_running_loop().call_later(
+            delay, self._due, vidid, fetch
+        )
+
+    def _due(self, vidid: str, fetch):
+        self.timers.pop(vidid, None)
+        if not queued(vidid):
+            self.entries.pop(vidid, None)
+            return
+        task = asyncio.create_task(flights.run(("live", vidid), self._resolve, vidid, fetch))
+        task.add_done_callback(lambda t: self._refreshed(vidid, fetch, t))
+
+    def _refreshed(self, vidid: str, fetch, task):
+        if task.cancelled() or not task.exception():
+            return
+        LOGGER(__name__).warning(f"Refreshing live url of {vidid} failed: {task.exception()}")
+        # try again later unless the url we still hold is about to lapse
+        entry = self.entries.get(vidid)
+        if entry and entry[1] - time.time() > MIN_REMAINING:
+            self.timers[vidid] = asyncio.get_running_loop().call_later(
+                MIN_REMAINING, self._due, vidid, fetch
+            )
+
+    async def get(self, vidid: str, fetch) -> str:
+        """Cached url for a live video id, `fetch(vidid)` resolves a new one."""
+        entry = self.entries.get(vidid)
+        if entry and entry[1] - time.time() > MIN_REMAINING:
+            return entry[0]
+        self.entries.pop(vidid, None)
+        return await flights.run(("live", vidid), self._resolve, vidid, fetch)
+
+    def forget(self, vidid: str):
+        """Drop a url the player could not open."""
+        self.entries.pop(vidid, None)
+        timer = self.timers.pop(vidid, None)
+        if timer:
+            timer.cancel()
+
+
+live_urls = LiveUrls()
+
+
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -0,0 +1,180 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+
+import asyncio
+import re
+import time
+from collections import OrderedDict
+
+from youtubesearchpython.__future__ import VideosSearch
+
+import config
+from ShrutiMusic.core.mongo import mongodb
+from ShrutiMusic.utils.formatters import time_to_seconds
+from ShrutiMusic.utils.stream.singleflight import flights
+
+metadb = mongodb.ytmeta
+
+VIDEO_ID = re.compile(r"(?:v=|youtu\.be/|shorts/|live/|embed/)([\w-]{11})")
+QUERY_TTL = 3600
+QUERY_CACHE_SIZE = 512
+
+
+def video_id_of(link: str):
+    match = VIDEO_ID.search(link)
+    return match.group(1) if match else None
+
+
+def parse_result(result: dict) -> dict:
+    duration = result.get("duration")
+    return {
+        "_id": result["id"],
+        "id": result["id"],
+        "title": result.get("title"),
+        "duration": duration,
+        "duration_sec": 0 if str(duration) == "None" else int(time_to_seconds(duration)),
+        "thumb": result["thumbnails"][0]["url"].split("?")[0],
+        "link": result.get("link"),
+        "views": (result.get("viewCount") or {}).get("short"),
+        "channel": (result.get("channel") or {}).get("name"),
+        "fetched": time.time(),
+    }
+
+
+class MetadataCache:
+    """
+    YouTube video metadata keyed by video id, shared by details, title,
+    duration, thumbnail, track and the thumbnail renderer.
+
+    Lookups go memory LRU -> mongo -> one VideosSearch, concurrent misses of
+    the same id share the remote call. An entry is fresh for YT_META_TTL,
+    after that it is still served while a background refresh runs. Ids
+    that return nothing are remembered for YT_META_MISS_TTL.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.entries = OrderedDict()
+        # search text -> (video id, expiry)
+        self.queries = OrderedDict()
+        self.counters = {"memory": 0, "mongo": 0, "remote": 0, "missing": 0}
+
+    def _remember(self, meta: dict):
+        self.entries[meta["_id"]] = meta
+        self.entries.move_to_end(meta["_id"])
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def _fresh(self, meta: dict) -> bool:
+        ttl = config.YT_META_MISS_TTL if meta.get("missing") else config.YT_META_TTL
+        return time.time() - meta["fetched"] < ttl
+
+    async def _store(self, meta: dict):
+        self._remember(meta)
+        await metadb.replace_one({"_id": meta["_id"]}, meta, upsert=True)
+
+    def seed(self, result: dict):
+        """Keep a search result someone else fetched, in memory only."""
+        if result.get("id") and result["id"] not in self.entries:
+            self._remember(parse_result(result))
+
+    async def _search(self, query: str) -> list:
+        self.counters["remote"] += 1
+        return (await VideosSearch(query, limit=1).next())["result"]
+
+    async def _fetch(self, vidid: str) -> dict:
+        found = await self._search(f"https://www.youtube.com/watch?v={vidid}")
+        if found:
+            meta = parse_result(found[0])
+            meta["_id"] = vidid
+        else:
+            meta = {"_id": vidid, "missing": True, "fetched": time.time()}
+        await self._store(meta)
+        return meta
+
+    def _refresh(self, vidid: str):
+        if ("ytmeta", vidid) in flights.flights:
+            return
+        task = asyncio.create_task(flights.run(("ytmeta", vidid), self._fetch, vidid))
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def get(self, vidid: str):
+        """Metadata dict for a video id, None for ids YouTube has nothing for."""
+        meta = self.entries.get(vidid)
+        if meta is not None:
+            self.entries.move_to_end(vidid)
+            self.counters["memory"] += 1
+        else:
+            meta = await metadb.find_one({"_id": vidid})
+            if meta is not None:
+                self.counters["mongo"] += 1
+                self._remember(meta)
+        if meta is None or (meta.get("missing") and not self._fresh(meta)):
+            meta = await flights.run(("ytmeta", vidid), self._fetch, vidid)
+        elif not self._fresh(meta):
+            self._refresh(vidid)
+        if meta.get("missing"):
+            self.counters["missing"] += 1
+            return None
+        return meta
+
+    async def _resolve_query(self, query: str):
+        hit = self.queries.get(query)
+        if hit and hit[1] > time.monotonic():
+            self.queries.move_to_end(query)
+            return hit[0]
+        found = await self._search(query)
+        if not found:
+            return None
+        meta = parse_result(found[0])
+        await self._store(meta)
+        self.queries[query] = (meta["_id"], time.monotonic() + QUERY_TTL)
+        while len(self.queries) > QUERY_CACHE_SIZE:
+            self.queries.popitem(last=False)
+        return meta["_id"]
+
+    async def lookup(self, link: str):
+        """Metadata for a YouTube link or, failing that, a search text."""
+        vidid = video_id_of(link)
+        if vidid is None:
+            vidid = await self._resolve_query(link)
+            if vidid is None:
+                return None
+        return await self.get(vidid)
+
+
+metadata = MetadataCache(config.YT_META_CACHE_SIZE)
+
+
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -0,0 +1,76 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+
+import time
+
+# Playback position of a queue entry is derived on demand from a
+# monotonic anchor instead of being ticked by a timer:
+#   played = offset + (now - started - paused) * rate
+# "rate" is how many seconds of the file one wall second plays.
+
+
+def set_played(entry: dict, seconds=0, rate=None):
+    now = time.monotonic()
+    entry["offset"] = seconds
+    entry["started"] = now
+    entry["paused"] = 0.0
+    if entry.get("paused_at") is not None:
+        entry["paused_at"] = now
+    if rate is not None:
+        entry["rate"] = rate
+
+
+def get_played(entry: dict) -> int:
+    if "started" not in entry:
+        return int(entry.get("played", 0))
+    now = entry.get("paused_at") or time.monotonic()
+    elapsed = now - entry["started"] - entry.get("paused", 0.0)
+    played = entry["offset"] + max(elapsed, 0) * entry.get("rate", 1.0)
+    seconds = int(entry.get("seconds") or 0)
+    if seconds and played > seconds:
+        played = seconds
+    return int(played)
+
+
+def pause_played(entry: dict):
+    if entry.get("paused_at") is None:
+        entry["paused_at"] = time.monotonic()
+
+
+def resume_played(entry: dict):
+    paused_at = entry.get("paused_at")
+    if paused_at is not None:
+        entry["paused"] = entry.get("paused", 0.0) + time.monotonic() - paused_at
+        entry["paused_at"] = None
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -0,0 +1,107 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+
+import asyncio
+
+import config
+from ShrutiMusic.logging import LOGGER
+from ShrutiMusic.misc import db
+from ShrutiMusic.utils.stream.cache import media_cache
+
+# chat_id -> {(vidid, video): task}
+prefetching = {}
+budget = asyncio.Semaphore(config.PREFETCH_WORKERS)
+
+
+def prefetch(chat_id):
+    """
+    Download the next PREFETCH_DEPTH queued YouTube entries in the background
+    so change_stream finds them in the media cache. Call whenever a track
+    starts or the queue changes; prefetches for entries that left the
+    window are cancelled. A prefetch of the track that just became the head
+    keeps running, the player is about to wait on that very download.
+    """
+    queue = db.get(chat_id) or []
+    wanted = set()
+    head = None
+    for index, entry in enumerate(queue[: 1 + config.PREFETCH_DEPTH]):
+        if "vid_" in str(entry.get("file")):
+            key = (entry["vidid"], str(entry.get("streamtype")) == "video")
+            wanted.add(key)
+            if index == 0:
+                head = key
+    tasks = prefetching.setdefault(chat_id, {})
+    for key in list(tasks):
+        if key not in wanted:
+            tasks.pop(key).cancel()
+    for key in wanted:
+        if key in tasks or key == head or media_cache.has(*key):
+            continue
+        tasks[key] = asyncio.create_task(_fetch(chat_id, key))
+    if not tasks:
+        prefetching.pop(chat_id, None)
+
+
+def cancel_prefetch(chat_id):
+    for task in prefetching.pop(chat_id, {}).values():
+        task.cancel()
+
+
+async def _fetch(chat_id, key):
+    # only the download backends: the stream url and size-checked fallbacks
+    # of YouTube.download give nothing worth keeping for a cache warm-up
+    from ShrutiMusic.platforms.Youtube import (
+        download_song_combined,
+        download_video_combined,
+    )
+
+    vidid, video = key
+    link = f"https://www.youtube.com/watch?v={vidid}"
+    try:
+        async with budget:
+            if media_cache.has(vidid, video):
+                return
+            download = download_video_combined if video else download_song_combined
+            media_cache.put(vidid, video, await download(link))
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        LOGGER(__name__).warning(f"Prefetch of {vidid} failed: {e}")
+    finally:
+        tasks = prefetching.get(chat_id)
+        if tasks and tasks.get(key) is asyncio.current_task():
+            tasks.pop(key)
+            if not tasks:
+                prefetching.pop(chat_id, None)
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -25,6 +25,8 @@ from typing import Union
 
 from ShrutiMusic.misc import db
 from ShrutiMusic.utils.formatters import check_duration, seconds_to_min
+from ShrutiMusic.utils.stream.position import set_played
+from ShrutiMusic.utils.stream.prefetch import prefetch
 from config import autoclean, time_to_seconds
 
 
@@ -55,8 +57,8 @@ async def put_queue(
         "file": file,
         "vidid": vidid,
         "seconds": duration_in_seconds,
-        "played": 0,
     }
+    set_played(put)
     if forceplay:
         check = db.get(chat_id)
         if check:
@@ -67,6 +69,7 @@ async def put_queue(
     else:
         db[chat_id].append(put)
     autoclean.append(file)
+    prefetch(chat_id)
 
 
 async def put_queue_index(
@@ -100,8 +103,8 @@ async def put_queue_index(
         "file": file,
         "vidid": vidid,
         "seconds": dur,
-        "played": 0,
     }
+    set_played(put)
     if forceplay:
         check = db.get(chat_id)
         if check:
@@ -0,0 +1,194 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+
+
+import asyncio
+import bisect
+import json
+import os
+import subprocess
+from collections import OrderedDict
+
+from ShrutiMusic.logging import LOGGER
+
+# Per-file seek index stored next to the media as <file>.idx:
+#   {"size", "mtime", "duration", "keyframes": [[seconds, byte offset], ...]}
+# built once by ffprobe after download, so seeking and duration lookups
+# never have to probe the file again.
+
+INDEX_SUFFIX = ".idx"
+INDEX_STEP = 2.0  # keep at most one keyframe every INDEX_STEP seconds
+LOADED_LIMIT = 256
+
+loaded = OrderedDict()
+remote = OrderedDict()  # url -> duration, for streams that can't be indexed
+building = set()
+
+
+def index_file(path: str) -> str:
+    return path + INDEX_SUFFIX
+
+
+def _packets(path: str, stream: str):
+    command = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        stream,
+        "-show_entries",
+        "packet=pts_time,pos,flags:format=duration",
+        "-of",
+        "csv=p=1",
+        path,
+    ]
+    out = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout
+    duration = None
+    keyframes = []
+    last = None
+    for line in out.decode(errors="ignore").splitlines():
+        parts = line.split(",")
+        if parts[0] == "format" and len(parts) > 1:
+            try:
+                duration = float(parts[1])
+            except ValueError:
+                pass
+        elif parts[0] == "packet" and len(parts) >= 4 and "K" in parts[3]:
+            try:
+                seconds, pos = float(parts[1]), int(parts[2])
+            except ValueError:
+                continue
+            if last is None or seconds - last >= INDEX_STEP:
+                keyframes.append([round(seconds, 3), pos])
+                last = seconds
+    return duration, keyframes
+
+
+def build_index(path: str):
+    """Blocking: probe `path` and write its index. Returns the index or None."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    duration, keyframes = _packets(path, "v:0")
+    if not keyframes:
+        duration, keyframes = _packets(path, "a:0")
+    if duration is None and keyframes:
+        duration = keyframes[-1][0]
+    if duration is None:
+        return None
+    index = {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "duration": duration,
+        "keyframes": keyframes,
+    }
+    temp = index_file(path) + ".tmp"
+    try:
+        with open(temp, "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(temp, index_file(path))
+    except OSError as e:
+        LOGGER(__name__).warning(f"Could not write seek index for {path}: {e}")
+    _remember(path, index)
+    return index
+
+
+def _remember(path, index):
+    loaded[path] = index
+    loaded.move_to_end(path)
+    while len(loaded) > LOADED_LIMIT:
+        loaded.popitem(last=False)
+
+
+def load_index(path: str):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    index = loaded.get(path)
+    if index is None:
+        try:
+            with open(index_file(path)) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+    if index.get("size") != stat.st_size or index.get("mtime") != stat.st_mtime:
+        loaded.pop(path, None)
+        return None
+    _remember(path, index)
+    return index
+
+
+def schedule_index(path: str):
+    """Build the index in the default executor unless it exists already."""
+    if not path or path in building or not os.path.isfile(path):
+        return
+    if os.path.isfile(index_file(path)):
+        return
+    building.add(path)
+    future = asyncio.get_running_loop().run_in_executor(None, build_index, path)
+    future.add_done_callback(lambda _: building.discard(path))
+
+
+def drop_index(path: str):
+    loaded.pop(path, None)
+    try:
+        os.remove(index_file(path))
+    except OSError:
+        pass
+
+
+def indexed_duration(path: str):
+    if path in remote:
+        return remote[path]
+    index = load_index(path)
+    return index["duration"] if index else None
+
+
+def remember_duration(path: str, duration):
+    remote[path] = duration
+    while len(remote) > LOADED_LIMIT:
+        remote.popitem(last=False)
+
+
+def keyframe_before(path: str, seconds):
+    """Time of the last indexed keyframe at or before `seconds`, or None."""
+    index = load_index(path)
+    if not index or not index["keyframes"]:
+        return None
+    times = [k[0] for k in index["keyframes"]]
+    i = bisect.bisect_right(times, seconds) - 1
+    return times[i] if i >= 0 else 0
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -0,0 +1,144 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+
+import asyncio
+
+from ShrutiMusic.core.edits import FOREGROUND, edits
+
+PROGRESS_STEP = 10
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one running task.
+
+    Every caller awaits the same future; the mystic messages of all
+    waiting callers receive the progress reported by the leader.
+    """
+
+    def __init__(self):
+        self.flights = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def run(self, key, func, *args, mystic=None):
+        flight = self.flights.get(key)
+        if flight is not None and (flight["abandoned"] or flight["future"].done()):
+            # its leader is being cancelled or already finished, never join that
+            flight = None
+        if flight is None:
+            loop = asyncio.get_running_loop()
+            flight = {
+                "future": loop.create_future(),
+                "watchers": [],
+                "waiting": 0,
+                "step": 0,
+                "loop": loop,
+                "abandoned": False,
+            }
+            self.flights[key] = flight
+            self.started += 1
+            flight["task"] = loop.create_task(self._lead(key, flight, func, args))
+        else:
+            self.coalesced += 1
+        if mystic is not None:
+            flight["watchers"].append(mystic)
+        flight["waiting"] += 1
+        try:
+            return await asyncio.shield(flight["future"])
+        except asyncio.CancelledError:
+            # Nobody is left waiting for this result: stop the work too.
+            if flight["waiting"] == 1 and not flight["task"].done():
+                flight["abandoned"] = True
+                self._forget(key, flight)
+                flight["task"].cancel()
+            raise
+        finally:
+            flight["waiting"] -= 1
+            if mystic is not None and mystic in flight["watchers"]:
+                flight["watchers"].remove(mystic)
+                # the caller edits this message next, stale progress must not land after it
+                edits.drop(mystic)
+
+    async def _lead(self, key, flight, func, args):
+        try:
+            result = await func(*args)
+        except asyncio.CancelledError:
+            flight["future"].cancel()
+            raise
+        except Exception as e:
+            if not flight["future"].done():
+                flight["future"].set_exception(e)
+                flight["future"].exception()
+        else:
+            if not flight["future"].done():
+                flight["future"].set_result(result)
+        finally:
+            self._forget(key, flight)
+
+    def _forget(self, key, flight):
+        # a newer flight may already run under this key, leave that one alone
+        if self.flights.get(key) is flight:
+            self.flights.pop(key)
+
+    def report(self, key, done, total):
+        """Thread-safe: may be called from executor threads (yt-dlp hooks)."""
+        flight = self.flights.get(key)
+        if not flight or not total:
+            return
+        step = int(done * 100 / total) // PROGRESS_STEP * PROGRESS_STEP
+        if step <= flight["step"] or step >= 100:
+            return
+        flight["step"] = step
+        flight["loop"].call_soon_threadsafe(
+            lambda: flight["loop"].create_task(self._fanout(flight, step))
+        )
+
+    def hook(self, key):
+        def _hook(d):
+            if d.get("status") != "downloading":
+                return
+            total = d.get("total_bytes") or d.get("total_bytes_estimate")
+            self.report(key, d.get("downloaded_bytes") or 0, total)
+
+        return _hook
+
+    async def _fanout(self, flight, step):
+        bar = "▰" * (step // PROGRESS_STEP) + "▱" * ((100 - step) // PROGRESS_STEP)
+        for mystic in list(flight["watchers"]):
+            edits.submit(mystic, "edit_text", FOREGROUND, text=f"<b>⬇️ {bar} {step}%</b>")
+
+
+flights = SingleFlight()
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -0,0 +1,165 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+
+import asyncio
+import os
+import shutil
+from collections import OrderedDict
+
+import config
+from ShrutiMusic.logging import LOGGER
+from ShrutiMusic.utils.stream.seekindex import keyframe_before
+
+SPEED_FOLDER = "playback"
+
+
+def live_parameters(speed: float, seconds=0, video: bool = False, keyframe: bool = False) -> str:
+    """
+    ffmpeg parameters that play a file from `seconds` at `speed` without
+    transcoding it first: the audio pipe goes through atempo, the video pipe
+    has its input timestamps rescaled (py-tgcalls appends its own -vf).
+    """
+    seek = f"-ss {seconds}" if seconds else ""
+    if seek and keyframe:
+        seek += " -noaccurate_seek"
+    if speed == 1.0:
+        return seek
+    params = f"--audio {seek} -atmid -filter:a atempo={speed:g}"
+    if video:
+        params += f" --video {seek} -itsscale {1 / speed:g}"
+    return params
+
+
+class SpeedCache:
+    """
+    Speed changes are streamed through live filters. Only a (file, speed)
+    pair asked for SPEED_CACHE_HITS times gets rendered in the background,
+    and at most SPEED_CACHE_FILES renders are kept on disk (LRU).
+    """
+
+    def __init__(self, folder: str, limit: int, hot: int):
+        self.folder = folder
+        self.limit = limit
+        self.hot = hot
+        self.requests = OrderedDict()
+        self.files = OrderedDict()
+        self.rendering = {}
+        # renders of earlier runs are not indexed, start from a clean folder
+        shutil.rmtree(folder, ignore_errors=True)
+
+    def parameters(self, path: str, speed, seconds: int, video: bool):
+        """Returns (file to stream, additional ffmpeg parameters, start second)."""
+        speed = float(speed)
+        key = (path, speed, video)
+        out = self.files.get(key)
+        if out and os.path.isfile(out):
+            self.files.move_to_end(key)
+            position = int(seconds / speed)
+            return out, f"-ss {position}" if position else "", seconds
+        self.files.pop(key, None)
+        if speed != 1.0 and self.limit > 0:
+            self._count(key)
+        start = keyframe_before(path, seconds)
+        if start is not None:
+            seconds = start
+        return path, live_parameters(speed, seconds, video, start is not None), seconds
+
+    def _count(self, key):
+        self.requests[key] = self.requests.get(key, 0) + 1
+        self.requests.move_to_end(key)
+        while len(self.requests) > 1000:
+            self.requests.popitem(last=False)
+        if self.requests[key] >= self.hot and key not in self.rendering:
+            self.rendering[key] = asyncio.create_task(self._render(key))
+
+    async def _render(self, key):
+        path, speed, video = key
+        folder = os.path.join(self.folder, f"{speed:g}")
+        os.makedirs(folder, exist_ok=True)
+        name, ext = os.path.splitext(os.path.basename(path))
+        out = os.path.join(folder, f"{name}{'_v' if video else ''}{ext}")
+        part = f"{out}.part{ext}"
+        cmd = ["ffmpeg", "-nostdin", "-y", "-i", path]
+        if video:
+            cmd += ["-filter:v", f"setpts={1 / speed:g}*PTS"]
+        else:
+            cmd += ["-vn"]
+        cmd += ["-filter:a", f"atempo={speed:g}", part]
+        proc = None
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            if await proc.wait() != 0 or not os.path.isfile(part):
+                raise RuntimeError(f"ffmpeg exited with {proc.returncode}")
+            os.replace(part, out)
+        except asyncio.CancelledError:
+            if proc and proc.returncode is None:
+                proc.kill()
+            raise
+        except Exception as e:
+            LOGGER(__name__).warning(f"Speed render of {path} at {speed}x failed: {e}")
+            if os.path.isfile(part):
+                os.remove(part)
+            return
+        finally:
+            self.rendering.pop(key, None)
+        self.requests.pop(key, None)
+        self.files[key] = out
+        while len(self.files) > self.limit:
+            _, old = self.files.popitem(last=False)
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+    def forget(self, path: str):
+        """Drop renders of a file that is being removed from disk."""
+        for key in [k for k in self.files if k[0] == path]:
+            try:
+                os.remove(self.files.pop(key))
+            except OSError:
+                pass
+
+
+speed_cache = SpeedCache(SPEED_FOLDER, config.SPEED_CACHE_FILES, config.SPEED_CACHE_HITS)
+
+
+def reset_speed(entry: dict):
+    entry["speed_path"] = None
+    entry["speed"] = 1.0
+    entry["rate"] = 1.0
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -20,7 +20,9 @@
 # Email: badboy809075@gmail.com
 
 
+import asyncio
 import os
+from collections import deque
 from random import randint
 from typing import Union
 
@@ -29,15 +31,55 @@ from pyrogram.types import InlineKeyboardMarkup
 import config
 from ShrutiMusic import Carbon, YouTube, app
 from ShrutiMusic.core.call import Nand
+from ShrutiMusic.logging import LOGGER
 from ShrutiMusic.misc import db
 from ShrutiMusic.utils.database import add_active_video_chat, is_active_chat
 from ShrutiMusic.utils.exceptions import AssistantErr
 from ShrutiMusic.utils.inline import aq_markup, close_markup, stream_markup
 from ShrutiMusic.utils.pastebin import NandBin
+from ShrutiMusic.utils.stream.live import live_urls
 from ShrutiMusic.utils.stream.queue import put_queue, put_queue_index
 from ShrutiMusic.utils.thumbnails import gen_thumb
 
 
+async def _resolve_ordered(items, resolve, workers: int):
+    """
+    Yield resolve(item) in order while up to `workers` items resolve ahead.
+    `items` may be a list or an async generator still producing entries.
+    """
+    if hasattr(items, "__aiter__"):
+        source = items.__aiter__()
+    else:
+        plain = iter(items)
+
+        async def source_gen():
+            for item in plain:
+                yield item
+
+        source = source_gen()
+    pending = deque()
+
+    async def feed():
+        try:
+            item = await source.__anext__()
+        except StopAsyncIteration:
+            return False
+        pending.append(asyncio.create_task(resolve(item)))
+        return True
+
+    try:
+        while len(pending) < workers and await feed():
+            pass
+        while pending:
+            result = await pending.popleft()
+            await feed()
+            yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        await source.aclose()
+
+
 async def stream(
     _,
     mystic,
@@ -58,83 +100,111 @@ async def stream(
     if streamtype == "playlist":
         msg = f"{_['play_19']}\n\n"
         count = 0
-        for search in result:
-            if int(count) == config.PLAYLIST_FETCH_LIMIT:
-                continue
+
+        async def resolve(search):
             try:
-                (
-                    title,
-                    duration_min,
-                    duration_sec,
-                    thumbnail,
-                    vidid,
-                ) = await YouTube.details(search, False if spotify else True)
+                return await YouTube.details(search, False if spotify else True)
             except:
-                continue
-            if str(duration_min) == "None":
-                continue
-            if duration_sec > config.DURATION_LIMIT:
-                continue
-            if await is_active_chat(chat_id):
-                await put_queue(
-                    chat_id,
-                    original_chat_id,
-                    f"vid_{vidid}",
-                    title,
-                    duration_min,
-                    user_name,
-                    vidid,
-                    user_id,
-                    "video" if video else "audio",
-                )
-                position = len(db.get(chat_id)) - 1
-                count += 1
-                msg += f"{count}. {title[:70]}\n"
-                msg += f"{_['play_20']} {position}\n\n"
-            else:
-                if not forceplay:
-                    db[chat_id] = []
-                status = True if video else None
-                try:
-                    file_path, direct = await YouTube.download(
-                        vidid, mystic, video=status, videoid=True
+                return None
+
+        fetched = 0
+
+        async def entries():
+            # YouTube playlists arrive lazily, their extraction errors land here
+            nonlocal fetched
+            try:
+                if hasattr(result, "__aiter__"):
+                    async for item in result:
+                        fetched += 1
+                        yield item
+                else:
+                    for item in result:
+                        fetched += 1
+                        yield item
+            except Exception as e:
+                if not fetched:
+                    raise AssistantErr(_["play_3"]) from e
+                LOGGER(__name__).warning(f"Playlist stopped after {fetched} entries: {e}")
+            finally:
+                if hasattr(result, "aclose"):
+                    await result.aclose()
+
+        resolved = _resolve_ordered(entries(), resolve, config.PLAYLIST_RESOLVE_WORKERS)
+        try:
+            async for details in resolved:
+                if int(count) == config.PLAYLIST_FETCH_LIMIT:
+                    break
+                if details is None:
+                    continue
+                title, duration_min, duration_sec, thumbnail, vidid = details
+                if str(duration_min) == "None":
+                    continue
+                if duration_sec > config.DURATION_LIMIT:
+                    continue
+                if await is_active_chat(chat_id):
+                    await put_queue(
+                        chat_id,
+                        original_chat_id,
+                        f"vid_{vidid}",
+                        title,
+                        duration_min,
+                        user_name,
+                        vidid,
+                        user_id,
+                        "video" if video else "audio",
                     )
-                except:
-                    raise AssistantErr(_["play_14"])
-                await Nand.join_call(
-                    chat_id,
-                    original_chat_id,
-                    file_path,
-                    video=status,
-                    image=thumbnail,
-                )
-                await put_queue(
-                    chat_id,
-                    original_chat_id,
-                    file_path if direct else f"vid_{vidid}",
-                    title,
-                    duration_min,
-                    user_name,
-                    vidid,
-                    user_id,
-                    "video" if video else "audio",
-                    forceplay=forceplay,
-                )
-                img = await gen_thumb(vidid)
-                button = stream_markup(_, chat_id)
-                run = await app.send_photo(
-                    original_chat_id,
-                    photo=img,
-                    caption=_["stream_1"].format(
-                        f"https://t.me/{app.username}?start=info_{vidid}",
-                        title[:23],
+                    position = len(db.get(chat_id)) - 1
+                    count += 1
+                    msg += f"{count}. {title[:70]}\n"
+                    msg += f"{_['play_20']} {position}\n\n"
+                else:
+                    if not forceplay:
+                        db[chat_id] = []
+                    status = True if video else None
+                    try:
+                        file_path, direct = await YouTube.download(
+                            vidid, mystic, video=status, videoid=True
+                        )
+                    except:
+                        raise AssistantErr(_["play_14"])
+                    await Nand.join_call(
+                        chat_id,
+                        original_chat_id,
+                        file_path,
+                        video=status,
+                        image=thumbnail,
+                    )
+                    await put_queue(
+                        chat_id,
+                        original_chat_id,
+                        file_path if direct else f"vid_{vidid}",
+                        title,
                         duration_min,
                         user_name,
-                    ),
-                    reply_markup=InlineKeyboardMarkup(button),
-                )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "stream"
+                        vidid,
+                        user_id,
+                        "video" if video else "audio",
+                        forceplay=forceplay,
+                    )
+                    img = await gen_thumb(vidid)
+                    button = stream_markup(_, chat_id)
+                    run = await app.send_photo(
+                        original_chat_id,
+                        photo=img,
+                        caption=_["stream_1"].format(
+                            f"https://t.me/{app.username}?start=info_{vidid}",
+                            title[:23],
+                            duration_min,
+                            user_name,
+                        ),
+                        reply_markup=InlineKeyboardMarkup(button),
+                    )
+                    db[chat_id][0]["mystic"] = run
+                    db[chat_id][0]["markup"] = "stream"
+        finally:
+            await resolved.aclose()
+        if not fetched:
+            raise AssistantErr(_["play_3"])
         if count == 0:
             return
         else:
@@ -360,16 +430,20 @@ async def stream(
         else:
             if not forceplay:
                 db[chat_id] = []
-            n, file_path = await YouTube.video(link)
+            n, file_path = await YouTube.live(link)
             if n == 0:
                 raise AssistantErr(_["str_3"])
-            await Nand.join_call(
-                chat_id,
-                original_chat_id,
-                file_path,
-                video=status,
-                image=thumbnail if thumbnail else None,
-            )
+            try:
+                await Nand.join_call(
+                    chat_id,
+                    original_chat_id,
+                    file_path,
+                    video=status,
+                    image=thumbnail if thumbnail else None,
+                )
+            except Exception:
+                live_urls.forget(vidid)
+                raise
             await put_queue(
                 chat_id,
                 original_chat_id,
@@ -0,0 +1,92 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+"""
+Thumbnail render throughput.
+
+Run from the repo root with the bot's .env in place:
+
+    python -m benchmarks.thumbnails [renders]
+
+Measures renders per second of the Pillow pipeline used by gen_thumb,
+once on a single thread and once through the bounded render pool.
+No network access is needed: a bundled asset is used as artwork.
+"""
+
+import asyncio
+import glob
+import os
+import sys
+import time
+
+import config
+from ShrutiMusic.utils.thumbnails import render_pool, render_thumb
+
+ARTWORK = "ShrutiMusic/assets/upic.png"
+META = ("Benchmark Track Title That Wraps Onto Two Lines", "4:05", "1.2M views", "ShrutiBots")
+
+
+def serial(artwork, count):
+    start = time.perf_counter()
+    for i in range(count):
+        render_thumb(f"bench{i}", artwork, *META)
+    return count / (time.perf_counter() - start)
+
+
+async def pooled(artwork, count):
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[
+            loop.run_in_executor(render_pool, render_thumb, f"bench{i}", artwork, *META)
+            for i in range(count)
+        ]
+    )
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with open(ARTWORK, "rb") as f:
+        artwork = f.read()
+    render_thumb("benchwarmup", artwork, *META)
+    print(f"serial : {serial(artwork, count):.2f} renders/s")
+    rate = asyncio.run(pooled(artwork, count))
+    print(f"pool   : {rate:.2f} renders/s ({config.THUMB_WORKERS} workers)")
+    for path in glob.glob("cache/bench*_styled.png"):
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
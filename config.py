@@ -77,6 +77,8 @@ PRIVACY_LINK = os.getenv("PRIVACY_LINK", "https://graph.org/Privacy-Policy-05-01
 
 DURATION_LIMIT_MIN = int(os.getenv("DURATION_LIMIT", 86400))
 PLAYLIST_FETCH_LIMIT = int(os.getenv("PLAYLIST_FETCH_LIMIT", 90))
+# Playlist entries looked up at once while the first ones are queued.
+PLAYLIST_RESOLVE_WORKERS = int(os.getenv("PLAYLIST_RESOLVE_WORKERS", 8))
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 📦 File Size Limits (in bytes)
@@ -85,6 +87,100 @@ PLAYLIST_FETCH_LIMIT = int(os.getenv("PLAYLIST_FETCH_LIMIT", 90))
 TG_AUDIO_FILESIZE_LIMIT = int(os.getenv("TG_AUDIO_FILESIZE_LIMIT", 104857600))
 TG_VIDEO_FILESIZE_LIMIT = int(os.getenv("TG_VIDEO_FILESIZE_LIMIT", 2145386496))
 
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🗂️ Settings Cache
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+SETTINGS_CACHE_SIZE = int(os.getenv("SETTINGS_CACHE_SIZE", 50000))  # per setting
+SETTINGS_CACHE_TTL = int(os.getenv("SETTINGS_CACHE_TTL", 600))  # in seconds
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 💾 Media Cache & Download Settings
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+MEDIA_CACHE_SIZE = int(os.getenv("MEDIA_CACHE_SIZE", 2048))  # in MB
+MEDIA_CACHE_POLICY = os.getenv("MEDIA_CACHE_POLICY", "lru").lower()  # lru / lfu
+
+# Upcoming queue entries to download in the background, and how many
+# of those background downloads may run at once across all chats.
+PREFETCH_DEPTH = int(os.getenv("PREFETCH_DEPTH", 1))
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", 2))
+
+# Seconds to wait for the API before also starting the cookies download.
+# "auto" tunes the delay from observed API latency, 0 races both at once.
+DOWNLOAD_HEDGE_DELAY = os.getenv("DOWNLOAD_HEDGE_DELAY", "auto").lower()
+
+# Speed changes are streamed live. A file+speed asked for SPEED_CACHE_HITS
+# times is rendered once, and up to SPEED_CACHE_FILES renders are kept.
+SPEED_CACHE_HITS = int(os.getenv("SPEED_CACHE_HITS", 3))
+SPEED_CACHE_FILES = int(os.getenv("SPEED_CACHE_FILES", 10))
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🔎 YouTube Metadata Cache
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Seconds a video's title/duration/thumbnail stay fresh, seconds a dead
+# id is remembered, and how many videos are kept in memory.
+
+YT_META_TTL = int(os.getenv("YT_META_TTL", 86400))
+YT_META_MISS_TTL = int(os.getenv("YT_META_MISS_TTL", 3600))
+YT_META_CACHE_SIZE = int(os.getenv("YT_META_CACHE_SIZE", 1024))
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📡 Live Stream URLs
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Seconds before a live stream url expires that it is re-resolved, and how
+# long to keep a url that carries no expiry of its own.
+
+LIVE_URL_REFRESH = int(os.getenv("LIVE_URL_REFRESH", 300))
+LIVE_URL_TTL = int(os.getenv("LIVE_URL_TTL", 1800))
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🍪 Cookie Pool
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Seconds between checks of the cookies folder, cookie errors in a row
+# before a file is benched, and its first/longest bench in seconds.
+
+COOKIE_RESCAN = int(os.getenv("COOKIE_RESCAN", 30))
+COOKIE_FAIL_LIMIT = int(os.getenv("COOKIE_FAIL_LIMIT", 2))
+COOKIE_COOLDOWN = int(os.getenv("COOKIE_COOLDOWN", 300))
+COOKIE_MAX_COOLDOWN = int(os.getenv("COOKIE_MAX_COOLDOWN", 21600))
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🖼️ Thumbnail Render Settings
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+THUMB_CACHE_SIZE = int(os.getenv("THUMB_CACHE_SIZE", 500))
+THUMB_CACHE_TTL = int(os.getenv("THUMB_CACHE_TTL", 21600))  # in seconds
+THUMB_WORKERS = int(os.getenv("THUMB_WORKERS", 2))
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🌐 HTTP Client Settings
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", 100))
+HTTP_POOL_PER_HOST = int(os.getenv("HTTP_POOL_PER_HOST", 10))
+HTTP_TIMEOUT = int(os.getenv("HTTP_TIMEOUT", 30))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 2))
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# ✏️ Message Edit Scheduler
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Edits per second across the bot, edits per minute in one chat,
+# and how many edit requests may be in flight at once.
+EDIT_GLOBAL_RATE = float(os.getenv("EDIT_GLOBAL_RATE", 25))
+EDIT_CHAT_RATE = float(os.getenv("EDIT_CHAT_RATE", 20))
+EDIT_WORKERS = int(os.getenv("EDIT_WORKERS", 8))
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 📣 Broadcast Settings
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Highest send rate per second (lowered on FloodWait and regained
+# gradually), sends in flight at once, and targets per saved checkpoint.
+
+BROADCAST_RATE = float(os.getenv("BROADCAST_RATE", 25))
+BROADCAST_WORKERS = int(os.getenv("BROADCAST_WORKERS", 8))
+BROADCAST_BATCH = int(os.getenv("BROADCAST_BATCH", 200))
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 🎧 Spotify Developer Credentials
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -96,11 +192,47 @@ SPOTIFY_CLIENT_SECRET = os.getenv("SPOTIFY_CLIENT_SECRET", None)
 # 🧵 Session Strings (Pyrogram V2)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-STRING1 = os.getenv("STRING_SESSION", None)
-STRING2 = os.getenv("STRING_SESSION2", None)
-STRING3 = os.getenv("STRING_SESSION3", None)
-STRING4 = os.getenv("STRING_SESSION4", None)
-STRING5 = os.getenv("STRING_SESSION5", None)
+# Every STRING_SESSION<N> set in the environment starts assistant N,
+# so more assistants are just more STRING_SESSION6, 7, ... variables.
+# A bare STRING_SESSION is assistant 1.
+def _string_sessions() -> dict:
+    sessions = {}
+    for key, value in sorted(os.environ.items()):
+        if not re.fullmatch(r"STRING_SESSION\d*", key) or not value:
+            continue
+        number = int(key[len("STRING_SESSION"):] or 1)
+        if number in sessions:
+            raise SystemExit(
+                f"[ERROR] - {key} sets assistant {number} a second time. "
+                "Use either STRING_SESSION or STRING_SESSION1, not both."
+            )
+        sessions[number] = value
+    return dict(sorted(sessions.items()))
+
+
+STRING_SESSIONS = _string_sessions()
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🎙️ Assistant Placement
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# New chats go to the least loaded assistant, a video call counts as
+# VIDEO_CALL_WEIGHT audio calls. An assistant with ASSISTANT_ERROR_LIMIT
+# errors in the last ASSISTANT_ERROR_WINDOW seconds gets no new chats.
+# Idle chats move off an assistant carrying ASSISTANT_MIGRATE_GAP more
+# load than the lightest one, 0 keeps chats where they are.
+
+VIDEO_CALL_WEIGHT = float(os.getenv("VIDEO_CALL_WEIGHT", 3))
+ASSISTANT_ERROR_LIMIT = int(os.getenv("ASSISTANT_ERROR_LIMIT", 3))
+ASSISTANT_ERROR_WINDOW = int(os.getenv("ASSISTANT_ERROR_WINDOW", 300))
+ASSISTANT_MIGRATE_GAP = float(os.getenv("ASSISTANT_MIGRATE_GAP", 0))
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🧩 Assistant Worker Processes
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Run the assistants' voice chat clients in this many worker processes,
+# 0 keeps them inside the bot process.
+
+ASSISTANT_WORKERS = int(os.getenv("ASSISTANT_WORKERS", 0))
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # ⚙️ Runtime Configurations